@@ -5,6 +5,10 @@ CREATE TABLE IF NOT EXISTS passages (
     expresses_scepticism BOOLEAN
 );
 
+CREATE INDEX IF NOT EXISTS idx_passages_unprocessed
+    ON passages (id)
+    WHERE references_mythic_era IS NULL;
+
 CREATE TABLE IF NOT EXISTS content_queries (
     id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     passage_id TEXT NOT NULL REFERENCES passages(id) ON DELETE CASCADE,
@@ -14,6 +18,9 @@ CREATE TABLE IF NOT EXISTS content_queries (
     output_tokens INTEGER NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_content_queries_passage
+    ON content_queries (passage_id);
+
 CREATE TABLE IF NOT EXISTS noun_extraction_status (
     passage_id TEXT PRIMARY KEY REFERENCES passages(id) ON DELETE CASCADE,
     timestamp TEXT NOT NULL,
@@ -43,6 +50,9 @@ CREATE TABLE IF NOT EXISTS proper_nouns (
     UNIQUE(passage_id, exact_form)
 );
 
+CREATE INDEX IF NOT EXISTS idx_proper_nouns_reference
+    ON proper_nouns (reference_form, entity_type, passage_id);
+
 CREATE TABLE IF NOT EXISTS noun_centrality (
     id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     reference_form TEXT NOT NULL,
@@ -75,9 +85,17 @@ CREATE TABLE IF NOT EXISTS greek_sentences (
     english_sentence TEXT NOT NULL,
     references_mythic_era BOOLEAN,
     expresses_scepticism BOOLEAN,
+    legacy_label_source TEXT,
     PRIMARY KEY (passage_id, sentence_number)
 );
 
+ALTER TABLE greek_sentences
+    ADD COLUMN IF NOT EXISTS legacy_label_source TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_greek_sentences_unprocessed
+    ON greek_sentences (passage_id, sentence_number)
+    WHERE references_mythic_era IS NULL;
+
 CREATE TABLE IF NOT EXISTS sentence_tagging_runs (
     run_id TEXT PRIMARY KEY,
     started_at TEXT NOT NULL,
@@ -928,6 +946,9 @@ CREATE TABLE IF NOT EXISTS phrase_translations (
     output_tokens INTEGER NOT NULL
 );
 
+ALTER TABLE phrase_translations
+    ADD COLUMN IF NOT EXISTS is_proper_noun BOOLEAN DEFAULT FALSE;
+
 CREATE TABLE IF NOT EXISTS wikidata_entities (
     wikidata_qid TEXT PRIMARY KEY,
     label TEXT,
@@ -951,6 +972,9 @@ CREATE TABLE IF NOT EXISTS wikidata_links (
     UNIQUE(reference_form, entity_type)
 );
 
+CREATE INDEX IF NOT EXISTS idx_wikidata_links_reference_qid
+    ON wikidata_links (reference_form, entity_type) INCLUDE (wikidata_qid);
+
 CREATE TABLE IF NOT EXISTS manto_releases (
     record_id BIGINT PRIMARY KEY,
     concept_record_id BIGINT,
@@ -1363,6 +1387,15 @@ CREATE TABLE IF NOT EXISTS passage_summaries (
     output_tokens INTEGER
 );
 
+CREATE TABLE IF NOT EXISTS llm_completion_cache (
+    cache_key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response_text TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS mythicness_predictors (
     id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     phrase TEXT NOT NULL,
@@ -1375,6 +1408,9 @@ CREATE TABLE IF NOT EXISTS mythicness_predictors (
     timestamp TEXT NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_mythicness_predictors_coefficient
+    ON mythicness_predictors (coefficient DESC);
+
 CREATE TABLE IF NOT EXISTS skepticism_predictors (
     id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     phrase TEXT NOT NULL,
@@ -1387,6 +1423,9 @@ CREATE TABLE IF NOT EXISTS skepticism_predictors (
     timestamp TEXT NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_skepticism_predictors_coefficient
+    ON skepticism_predictors (coefficient DESC);
+
 CREATE TABLE IF NOT EXISTS simplified_mythicness_predictors (
     id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     phrase TEXT NOT NULL,
@@ -1517,6 +1556,9 @@ CREATE TABLE IF NOT EXISTS sentence_mythicness_predictors (
     timestamp TEXT NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_sentence_mythicness_predictors_coefficient
+    ON sentence_mythicness_predictors (coefficient DESC);
+
 CREATE TABLE IF NOT EXISTS sentence_skepticism_predictors (
     id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     phrase TEXT NOT NULL,
@@ -1529,6 +1571,9 @@ CREATE TABLE IF NOT EXISTS sentence_skepticism_predictors (
     timestamp TEXT NOT NULL
 );
 
+CREATE INDEX IF NOT EXISTS idx_sentence_skepticism_predictors_coefficient
+    ON sentence_skepticism_predictors (coefficient DESC);
+
 CREATE TABLE IF NOT EXISTS sentence_simplified_mythicness_predictors (
     id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     phrase TEXT NOT NULL,
@@ -4,13 +4,12 @@ import argparse
 import json
 import os
 import sys
-import time
 from datetime import datetime
 
-from openai import OpenAI
 from tqdm import tqdm
 
 from pausanias_db import add_database_argument, connect
+from pausanias_openai import add_rate_limit_argument, create_openai_client, create_rate_limiter
 
 QUIET_EMPTY_ENV_VAR = "PAUSANIAS_QUIET_EMPTY"
 
@@ -32,6 +31,7 @@ def parse_arguments():
                         help="OpenAI model to use (default: gpt-5)")
     parser.add_argument("--debug", action="store_true", default=False,
                         help="Print the full API response for debugging")
+    add_rate_limit_argument(parser)
     
     return parser.parse_args()
 
@@ -265,7 +265,8 @@ if __name__ == '__main__':
     api_key = load_openai_api_key(args.openai_api_key_file)
     
     # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    client = create_openai_client(api_key)
+    rate_limiter = create_rate_limiter(args.requests_per_minute)
     
     # Connect to the database
     conn = connect(args.database_url)
@@ -290,6 +291,8 @@ if __name__ == '__main__':
         total_output_tokens = 0
         
         for passage_id, passage_text in iterator:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
             proper_nouns, input_tokens, output_tokens = extract_proper_nouns(
                 client, args.model, passage_id, passage_text, args.debug
             )
@@ -312,9 +315,6 @@ if __name__ == '__main__':
             
             # Mark passage as processed
             mark_passage_processed(conn, passage_id, args.model, input_tokens, output_tokens)
-            
-            # Add a small delay to avoid rate limits
-            time.sleep(0.5)
         
         print(f"Processing complete. Total tokens used: {total_input_tokens} input, {total_output_tokens} output")
     
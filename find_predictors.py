@@ -129,6 +129,10 @@ def create_predictor_tables(conn):
         timestamp TEXT NOT NULL
     )
     ''')
+    # Dropping the table drops its indexes; the website reads it by coefficient
+    conn.execute(
+        "CREATE INDEX idx_mythicness_predictors_coefficient ON mythicness_predictors (coefficient DESC)"
+    )
 
     # Recreate skepticism predictors table with count columns
     conn.execute("DROP TABLE IF EXISTS skepticism_predictors")
@@ -145,6 +149,9 @@ def create_predictor_tables(conn):
         timestamp TEXT NOT NULL
     )
     ''')
+    conn.execute(
+        "CREATE INDEX idx_skepticism_predictors_coefficient ON skepticism_predictors (coefficient DESC)"
+    )
 
     create_simplified_predictor_table(conn, "simplified_mythicness_predictors", "mythic")
     create_simplified_predictor_table(conn, "simplified_skepticism_predictors", "skeptical")
@@ -129,6 +129,10 @@ def create_predictor_tables(conn):
         timestamp TEXT NOT NULL
     )
     ''')
+    # Dropping the table drops its indexes; the website reads it by coefficient
+    conn.execute(
+        "CREATE INDEX idx_sentence_mythicness_predictors_coefficient ON sentence_mythicness_predictors (coefficient DESC)"
+    )
 
     # Recreate skepticism predictors table with count columns
     conn.execute("DROP TABLE IF EXISTS sentence_skepticism_predictors")
@@ -145,6 +149,9 @@ def create_predictor_tables(conn):
         timestamp TEXT NOT NULL
     )
     ''')
+    conn.execute(
+        "CREATE INDEX idx_sentence_skepticism_predictors_coefficient ON sentence_skepticism_predictors (coefficient DESC)"
+    )
 
     create_simplified_predictor_table(conn, "sentence_simplified_mythicness_predictors", "mythic")
     create_simplified_predictor_table(conn, "sentence_simplified_skepticism_predictors", "skeptical")
@@ -272,12 +279,17 @@ def clear_predictor_tables(conn):
     print("Cleared existing predictor tables.")
 
 def get_analyzed_sentences(conn):
-    """Get sentences that have been analyzed for mythicness and skepticism."""
+    """Get sentences that have been analyzed for mythicness and skepticism.
+
+    Labels from the legacy analyser's local prefilter are left out: they are
+    a classifier's predictions, not annotations to learn predictors from.
+    """
     query = """
     SELECT sentence, references_mythic_era, expresses_scepticism
     FROM greek_sentences
     WHERE references_mythic_era IS NOT NULL
     AND expresses_scepticism IS NOT NULL
+    AND legacy_label_source IS DISTINCT FROM 'prefilter'
     """
 
     df = read_sql_query(query, conn)
@@ -0,0 +1,126 @@
+"""Exact-match cache of LLM text completions, stored in PostgreSQL."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+
+SELECT_CACHED_COMPLETION_SQL = """
+    SELECT response_text, input_tokens, output_tokens
+    FROM llm_completion_cache
+    WHERE cache_key = %s
+"""
+SELECT_CACHED_COMPLETIONS_SQL = """
+    SELECT cache_key, response_text, input_tokens, output_tokens
+    FROM llm_completion_cache
+    WHERE cache_key = ANY(%s)
+"""
+UPSERT_CACHED_COMPLETION_SQL = """
+    INSERT INTO llm_completion_cache
+    (cache_key, model, response_text, input_tokens, output_tokens, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (cache_key) DO UPDATE SET
+        response_text = EXCLUDED.response_text,
+        input_tokens = EXCLUDED.input_tokens,
+        output_tokens = EXCLUDED.output_tokens,
+        created_at = EXCLUDED.created_at
+"""
+
+
+def create_llm_cache_table(conn) -> None:
+    """Create the completion cache table if it doesn't exist."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_completion_cache (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            response_text TEXT NOT NULL,
+            input_tokens INTEGER NOT NULL,
+            output_tokens INTEGER NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+
+
+def completion_cache_key(model: str, system_prompt: str, user_content: str) -> str:
+    """Hash everything that determines a completion into a stable key."""
+    digest = hashlib.sha256()
+    for part in (model, system_prompt, user_content):
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so boundaries can't collide
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def get_cached_completion(
+    conn, model: str, system_prompt: str, user_content: str
+) -> tuple[str, int, int] | None:
+    """Return (response_text, input_tokens, output_tokens) for an identical earlier call."""
+    key = completion_cache_key(model, system_prompt, user_content)
+    row = conn.execute(SELECT_CACHED_COMPLETION_SQL, (key,), prepare=True).fetchone()
+    return (row[0], row[1], row[2]) if row else None
+
+
+def get_cached_completions(
+    conn, model: str, system_prompt: str, user_contents
+) -> dict[str, tuple[str, int, int]]:
+    """Look up many user contents in one query.
+
+    Returns {user_content: (response_text, input_tokens, output_tokens)} for
+    the contents that have an identical earlier call; misses are absent.
+    """
+    keys = {
+        completion_cache_key(model, system_prompt, user_content): user_content
+        for user_content in user_contents
+    }
+    if not keys:
+        return {}
+    rows = conn.execute(SELECT_CACHED_COMPLETIONS_SQL, (list(keys),)).fetchall()
+    return {keys[key]: (response_text, input_tokens, output_tokens)
+            for key, response_text, input_tokens, output_tokens in rows}
+
+
+def save_cached_completion(
+    conn,
+    model: str,
+    system_prompt: str,
+    user_content: str,
+    response_text: str,
+    input_tokens: int,
+    output_tokens: int,
+) -> None:
+    """Remember a completion without committing; the caller commits."""
+    key = completion_cache_key(model, system_prompt, user_content)
+    conn.execute(
+        UPSERT_CACHED_COMPLETION_SQL,
+        (key, model, response_text, input_tokens, output_tokens, datetime.now().isoformat()),
+        prepare=True,
+    )
+
+
+def save_cached_completions(conn, completions) -> None:
+    """Remember many completions in one executemany; the caller commits.
+
+    Each completion is (model, system_prompt, user_content, response_text,
+    input_tokens, output_tokens).
+    """
+    timestamp = datetime.now().isoformat()
+    conn.cursor().executemany(
+        UPSERT_CACHED_COMPLETION_SQL,
+        [
+            (
+                completion_cache_key(model, system_prompt, user_content),
+                model,
+                response_text,
+                input_tokens,
+                output_tokens,
+                timestamp,
+            )
+            for model, system_prompt, user_content, response_text, input_tokens, output_tokens
+            in completions
+        ],
+    )
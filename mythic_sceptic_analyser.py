@@ -4,17 +4,64 @@ import argparse
 import json
 import os
 import sys
-import time
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 import openai
-from openai import OpenAI
 from tqdm import tqdm
 
 from pausanias_db import add_database_argument, connect
+from pausanias_openai import (
+    add_rate_limit_argument,
+    create_openai_client,
+    create_rate_limiter,
+    map_concurrently,
+    rate_limited,
+)
 
 QUIET_EMPTY_ENV_VAR = "PAUSANIAS_QUIET_EMPTY"
+COMMIT_EVERY = 50
+# The answer is two booleans; the rest of the budget is reasoning headroom
+# for gpt-5-family models, whose reasoning tokens count against this cap.
+MAX_COMPLETION_TOKENS = 4096
+
+# Per-passage statements; psycopg prepares them server-side once per connection
+UPDATE_ANALYSIS_SQL = """
+    UPDATE passages
+    SET references_mythic_era = %s, expresses_scepticism = %s
+    WHERE id = %s
+"""
+INSERT_QUERY_METADATA_SQL = """
+    INSERT INTO content_queries (passage_id, timestamp, model, input_tokens, output_tokens)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+ANALYSIS_SYSTEM_PROMPT = """Act as a Pausanias scholar and report whether this passage of Pausanias is a reference to the mythic era, or whether it is closer to being historical. Then report whether Pausanias shows scepticism about the subject matter he is writing about."""
+
+ANALYSIS_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "save_annotations",
+            "description": "Save the analysis of whether the passage references the mythic era and expresses skepticism",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "references_mythic_era": {
+                        "type": "boolean",
+                        "description": "Whether the passage references the mythic era (true) or historical era (false)"
+                    },
+                    "expresses_scepticism": {
+                        "type": "boolean",
+                        "description": "Whether Pausanias expresses skepticism about the subject matter"
+                    }
+                },
+                "required": ["references_mythic_era", "expresses_scepticism"]
+            }
+        }
+    }
+]
 
 
 def should_suppress_empty_message():
@@ -32,6 +79,9 @@ def parse_arguments():
                         help="Show progress bar")
     parser.add_argument("--model", default="gpt-5",
                         help="OpenAI model to use (default: gpt-5)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of concurrent API calls (default: 1)")
+    add_rate_limit_argument(parser)
     
     return parser.parse_args()
 
@@ -56,6 +106,16 @@ def create_tracking_table(conn):
         FOREIGN KEY (passage_id) REFERENCES passages(id)
     )
     ''')
+    # Keep the unprocessed-passage lookup an index scan as labels fill in
+    conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_passages_unprocessed
+        ON passages (id)
+        WHERE references_mythic_era IS NULL
+    ''')
+    conn.execute('''
+    CREATE INDEX IF NOT EXISTS idx_content_queries_passage
+        ON content_queries (passage_id)
+    ''')
     conn.commit()
 
 def get_unprocessed_passages(conn, limit=None):
@@ -75,69 +135,40 @@ def get_unprocessed_passages(conn, limit=None):
     return cursor.fetchall()
 
 def save_analysis_results(conn, passage_id, references_mythic_era, expresses_scepticism):
-    """Save analysis results to the database."""
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        UPDATE passages 
-        SET references_mythic_era = %s, expresses_scepticism = %s
-        WHERE id = %s
-        """,
-        (references_mythic_era, expresses_scepticism, passage_id)
+    """Save analysis results to the database; the caller commits."""
+    conn.execute(
+        UPDATE_ANALYSIS_SQL,
+        (references_mythic_era, expresses_scepticism, passage_id),
+        prepare=True,
     )
-    conn.commit()
 
 def save_query_metadata(conn, passage_id, model, input_tokens, output_tokens):
-    """Save API call metadata to the tracking table."""
+    """Save API call metadata to the tracking table; the caller commits."""
     timestamp = datetime.now().isoformat()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO content_queries (passage_id, timestamp, model, input_tokens, output_tokens)
-        VALUES (%s, %s, %s, %s, %s)
-        """,
-        (passage_id, timestamp, model, input_tokens, output_tokens)
+    conn.execute(
+        INSERT_QUERY_METADATA_SQL,
+        (passage_id, timestamp, model, input_tokens, output_tokens),
+        prepare=True,
     )
-    conn.commit()
 
 def analyze_passage(client, model, passage_id, passage_text):
-    """Analyze a passage using OpenAI API with tool calls and track token usage."""
-    
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "save_annotations",
-                "description": "Save the analysis of whether the passage references the mythic era and expresses skepticism",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "references_mythic_era": {
-                            "type": "boolean",
-                            "description": "Whether the passage references the mythic era (true) or historical era (false)"
-                        },
-                        "expresses_scepticism": {
-                            "type": "boolean",
-                            "description": "Whether Pausanias expresses skepticism about the subject matter"
-                        }
-                    },
-                    "required": ["references_mythic_era", "expresses_scepticism"]
-                }
-            }
-        }
-    ]
-    
-    system_prompt = """Act as a Pausanias scholar and report whether this passage of Pausanias is a reference to the mythic era, or whether it is closer to being historical. Then report whether Pausanias shows scepticism about the subject matter he is writing about."""
+    """Analyze a passage using OpenAI API with tool calls and track token usage.
+
+    Returns (references_mythic_era, expresses_scepticism, input_tokens,
+    output_tokens, error). This runs on worker threads, so failures come back
+    as error text for the main loop to report rather than being printed here.
+    """
     
     try:
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
                 {"role": "user", "content": f"Passage {passage_id}:\n\n{passage_text}\n\nAnalyze this passage and provide your results using the save_annotations function."}
             ],
-            tools=tools,
-            tool_choice={"type": "function", "function": {"name": "save_annotations"}}
+            tools=ANALYSIS_TOOLS,
+            tool_choice={"type": "function", "function": {"name": "save_annotations"}},
+            max_completion_tokens=MAX_COMPLETION_TOKENS,
         )
         
         # Extract token usage
@@ -152,15 +183,25 @@ def analyze_passage(client, model, passage_id, passage_text):
                 function_args.get('references_mythic_era'),
                 function_args.get('expresses_scepticism'),
                 input_tokens,
-                output_tokens
+                output_tokens,
+                None,
             )
         
         # Return None values if no tool call was made
-        return None, None, input_tokens, output_tokens
+        return None, None, input_tokens, output_tokens, "no tool call in the response"
         
     except Exception as e:
-        print(f"Error analyzing passage {passage_id}: {str(e)}")
-        return None, None, 0, 0
+        return None, None, 0, 0, str(e)
+
+def analyze_passages_concurrently(client, model, passages, concurrency=1, rate_limiter=None):
+    """Yield (passage_id, analysis) pairs as API calls complete.
+
+    Worker threads only call the API; the caller consumes results on the main
+    thread and stays the only writer to the database connection.
+    """
+    analyse = rate_limited(partial(analyze_passage, client, model), rate_limiter)
+    for (passage_id, _), analysis in map_concurrently(analyse, passages, concurrency):
+        yield passage_id, analysis
 
 if __name__ == '__main__':
     args = parse_arguments()
@@ -169,10 +210,10 @@ if __name__ == '__main__':
     api_key = load_openai_api_key(args.openai_api_key_file)
     
     # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    client = create_openai_client(api_key)
     
     # Connect to the database
-    conn = connect(args.database_url)
+    conn = connect(args.database_url, bulk_writes=True)
     
     try:
         # Create the tracking table if it doesn't exist
@@ -189,14 +230,22 @@ if __name__ == '__main__':
         print(f"Found {len(passages)} unprocessed passages.")
         
         # Process passages
-        iterator = tqdm(passages) if args.progress_bar else passages
+        progress = tqdm(total=len(passages)) if args.progress_bar else None
+        # Messages that must still appear under --progress-bar go through
+        # tqdm.write so they don't tear the bar
+        report = progress.write if progress is not None else print
+        results = analyze_passages_concurrently(
+            client,
+            args.model,
+            passages,
+            args.concurrency,
+            create_rate_limiter(args.requests_per_minute),
+        )
         total_input_tokens = 0
         total_output_tokens = 0
         
-        for passage_id, passage_text in iterator:
-            references_mythic_era, expresses_scepticism, input_tokens, output_tokens = analyze_passage(
-                client, args.model, passage_id, passage_text
-            )
+        for count, (passage_id, analysis) in enumerate(results, start=1):
+            references_mythic_era, expresses_scepticism, input_tokens, output_tokens, error = analysis
             
             # Track tokens regardless of success
             total_input_tokens += input_tokens
@@ -212,15 +261,25 @@ if __name__ == '__main__':
                 
                 if not args.progress_bar:
                     print(f"Processed passage {passage_id}: mythic_era={references_mythic_era}, scepticism={expresses_scepticism}, tokens={input_tokens}/{output_tokens}")
+            elif error:
+                report(f"Failed to analyze passage {passage_id}: {error}")
             else:
-                print(f"Failed to analyze passage {passage_id}")
-            
-            # Add a small delay to avoid rate limits
-            time.sleep(0.5)
+                report(f"Failed to analyze passage {passage_id}")
+
+            # Commit in batches; a passage's labels and token metadata share a transaction
+            if count % COMMIT_EVERY == 0:
+                conn.commit()
+            if progress is not None:
+                progress.update()
+        conn.commit()
         
+        if progress is not None:
+            progress.close()
         print(f"Processing complete. Total tokens used: {total_input_tokens} input, {total_output_tokens} output")
     
     except Exception as e:
+        # Committing now would fail inside the aborted transaction and hide e
+        conn.rollback()
         print(f"Error: {str(e)}")
         sys.exit(1)
     
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import argparse
 import os
+import uuid
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
 import pandas as pd
 import psycopg
@@ -13,6 +14,21 @@ import psycopg
 
 DEFAULT_DATABASE_URL = "dbname=pausanias"
 
+# Session settings for the resumable LLM pipeline scripts. Every row they write
+# can be regenerated, so losing the last few commits after a server crash is
+# acceptable in exchange for not waiting on a WAL flush per commit.
+BULK_WRITE_SETTINGS = {
+    "synchronous_commit": "off",
+}
+
+# Session settings for the website build, which runs hundreds of analytic
+# queries over a small database. Sorts and hash aggregates stay in memory,
+# and JIT compilation (slower than just running these queries) is skipped.
+READ_HEAVY_SETTINGS = {
+    "work_mem": "64MB",
+    "jit": "off",
+}
+
 
 def get_database_url(database_url: str | None = None) -> str:
     """Resolve the PostgreSQL connection string for scripts."""
@@ -36,9 +52,31 @@ def add_database_argument(parser: argparse.ArgumentParser) -> None:
     )
 
 
-def connect(database_url: str | None = None) -> psycopg.Connection:
-    """Open a PostgreSQL connection."""
-    return psycopg.connect(get_database_url(database_url))
+def connect(
+    database_url: str | None = None,
+    *,
+    bulk_writes: bool = False,
+    read_heavy: bool = False,
+) -> psycopg.Connection:
+    """Open a PostgreSQL connection.
+
+    With ``bulk_writes`` the session is tuned for scripts that commit many
+    small, regenerable rows (see ``BULK_WRITE_SETTINGS``); with ``read_heavy``
+    it is tuned for the website build (see ``READ_HEAVY_SETTINGS``).
+    """
+    conn = psycopg.connect(get_database_url(database_url))
+    if bulk_writes:
+        configure_session(conn, BULK_WRITE_SETTINGS)
+    if read_heavy:
+        configure_session(conn, READ_HEAVY_SETTINGS)
+    return conn
+
+
+def configure_session(conn: psycopg.Connection, settings: dict[str, str]) -> None:
+    """Apply session-level settings to an open connection."""
+    for name, value in settings.items():
+        conn.execute("SELECT set_config(%s, %s, false)", (name, value))
+    conn.commit()
 
 
 def schema_path() -> Path:
@@ -66,6 +104,35 @@ def read_sql_query(
     return pd.DataFrame(rows, columns=columns)
 
 
+def stream_rows(
+    conn: psycopg.Connection,
+    query: str,
+    params: Iterable[Any] | dict[str, Any] | None = None,
+    *,
+    itersize: int = 1000,
+) -> Iterator[tuple]:
+    """Yield query rows through a server-side cursor, ``itersize`` at a time.
+
+    The cursor is declared WITH HOLD so callers can keep committing their own
+    writes while they iterate.
+    """
+    with conn.cursor(name=f"stream_{uuid.uuid4().hex}", withhold=True) as cursor:
+        cursor.itersize = itersize
+        cursor.execute(query, params)
+        yield from cursor
+
+
+def count_rows(
+    conn: psycopg.Connection,
+    query: str,
+    params: Iterable[Any] | dict[str, Any] | None = None,
+) -> int:
+    """Count the rows a query would return without fetching them."""
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM ({query}) AS counted", params)
+        return cursor.fetchone()[0]
+
+
 def table_exists(conn: psycopg.Connection, table_name: str) -> bool:
     with conn.cursor() as cursor:
         cursor.execute("SELECT to_regclass(%s)", (f"public.{table_name}",))
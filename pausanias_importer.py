@@ -2,52 +2,64 @@
 
 import argparse
 import sys
+import mmap
 import re
 import os.path
+from itertools import islice
 
 from pausanias_db import add_database_argument, connect, initialize_schema
 
+IMPORT_BATCH_SIZE = 1000
+_SECTION_RE = re.compile(rb'#(\d+\.\d+\.\d+)#\s*(.*?)(?=#\d+\.\d+\.\d+#|$)', re.DOTALL)
+_WS_RE = re.compile(r'\s+')
+UPSERT_PASSAGE_SQL = """
+    INSERT INTO passages (id, passage)
+    VALUES (%s, %s)
+    ON CONFLICT (id) DO UPDATE SET passage = EXCLUDED.passage
+    WHERE passages.passage IS DISTINCT FROM EXCLUDED.passage
+"""
+
 
 def create_db_schema(conn):
     """Create the database schema if it doesn't exist."""
     initialize_schema(conn)
 
 def parse_pausanias_file(file_path):
-    """Parse the Pausanias file and extract sections with their IDs."""
+    """Parse the Pausanias file and yield (section_id, text) for each section.
+
+    The file is memory-mapped and scanned as bytes, so only one section at a
+    time is decoded into a Python string.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Pattern to match section markers and content
-        pattern = r'#(\d+\.\d+\.\d+)#\s*(.*?)(?=#\d+\.\d+\.\d+#|$)'
-        matches = re.findall(pattern, content, re.DOTALL)
-        
-        parsed_sections = []
-        for section_id, section_text in matches:
-            # Clean up the text: remove excessive whitespace and join lines
-            cleaned_text = re.sub(r'\s+', ' ', section_text.strip())
-            parsed_sections.append((section_id, cleaned_text))
-        
-        return parsed_sections
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for match in _SECTION_RE.finditer(mm):
+                    section_text = match.group(2).decode('utf-8')
+                    # Clean up the text: remove excessive whitespace and join lines
+                    yield match.group(1).decode('ascii'), _WS_RE.sub(' ', section_text.strip())
     
     except Exception as e:
         raise RuntimeError(f"Failed to parse file {file_path}: {str(e)}")
 
 def import_passages(conn, passages):
-    """Import passages into the database."""
+    """Import passages into the database in a single transaction.
+
+    Unchanged passages are left untouched, so a re-import only rewrites rows
+    whose text actually changed. Returns the number of passages read.
+    """
     cursor = conn.cursor()
+    passages = iter(passages)
+    count = 0
     
-    for section_id, passage_text in passages:
-        cursor.execute(
-            """
-            INSERT INTO passages (id, passage)
-            VALUES (%s, %s)
-            ON CONFLICT (id) DO UPDATE SET passage = EXCLUDED.passage
-            """,
-            (section_id, passage_text)
-        )
+    # Bounded executemany batches keep memory flat for large inputs
+    while batch := list(islice(passages, IMPORT_BATCH_SIZE)):
+        cursor.executemany(UPSERT_PASSAGE_SQL, batch)
+        count += len(batch)
     
     conn.commit()
+    return count
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Import Pausanias passages into PostgreSQL")
@@ -64,18 +76,17 @@ if __name__ == '__main__':
         print(f"Error: Input file '{input_file}' not found.")
         sys.exit(1)
     
-    conn = connect(args.database_url)
+    conn = connect(args.database_url, bulk_writes=True)
     
     try:
         create_db_schema(conn)
-        passages = parse_pausanias_file(input_file)
+        imported = import_passages(conn, parse_pausanias_file(input_file))
         
-        if not passages:
+        if not imported:
             print("Warning: No passages found in the input file.")
             sys.exit(0)
         
-        import_passages(conn, passages)
-        print(f"Successfully imported {len(passages)} passages into PostgreSQL")
+        print(f"Successfully imported {imported} passages into PostgreSQL")
     
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,139 @@
+"""Shared OpenAI client helpers for the Pausanias pipeline."""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import wraps
+from typing import Any, Callable, Iterable, Iterator
+
+import httpx
+from openai import OpenAI
+
+
+# Long-lived pooled connections: concurrent workers multiplex over HTTP/2
+# instead of paying a TCP+TLS handshake per request.
+HTTP_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+# The SDK retries 429s and 5xxs with jittered exponential backoff and honours
+# Retry-After; give it enough attempts to ride out a rate-limit window.
+MAX_RETRIES = 6
+
+
+def create_http_client() -> httpx.Client:
+    """Build the keep-alive HTTP/2 transport used by OpenAI clients."""
+    return httpx.Client(http2=True, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+
+
+def create_openai_client(api_key: str, max_retries: int = MAX_RETRIES) -> OpenAI:
+    """Create an OpenAI client that reuses connections across calls."""
+    return OpenAI(api_key=api_key, http_client=create_http_client(), max_retries=max_retries)
+
+
+def add_rate_limit_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the standard --requests-per-minute option to a CLI parser."""
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=None,
+        help=(
+            "Cap on API requests per minute across all workers "
+            "(default: no cap; rate-limit errors are retried with backoff)"
+        ),
+    )
+
+
+class RateLimiter:
+    """Thread-safe token bucket that spaces calls to a requests-per-minute quota.
+
+    Up to one second's worth of calls may go out in a burst; after that each
+    ``acquire`` waits until the bucket has refilled by one token.
+    """
+
+    def __init__(self, requests_per_minute: float) -> None:
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def create_rate_limiter(requests_per_minute: float | None) -> RateLimiter | None:
+    """Build a limiter for ``--requests-per-minute``; None means unlimited."""
+    return RateLimiter(requests_per_minute) if requests_per_minute else None
+
+
+def rate_limited(fn: Callable[..., Any], rate_limiter: RateLimiter | None) -> Callable[..., Any]:
+    """Wrap ``fn`` so every call first waits on ``rate_limiter``."""
+    if rate_limiter is None:
+        return fn
+
+    @wraps(fn)
+    def limited(*args, **kwargs):
+        rate_limiter.acquire()
+        return fn(*args, **kwargs)
+
+    return limited
+
+
+def prompt_cache_options(cache_key: str) -> dict[str, Any]:
+    """Request arguments that route calls sharing a prompt prefix together.
+
+    OpenAI caches long prompt prefixes automatically; a stable
+    ``prompt_cache_key`` keeps calls with the same system prompt on the same
+    cache shard so the prefix is actually reused.
+    """
+    return {"extra_body": {"prompt_cache_key": cache_key}}
+
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """Return how many prompt tokens the API served from its prompt cache."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None) or 0
+
+
+def map_concurrently(
+    fn: Callable[..., Any], rows: Iterable[tuple], concurrency: int = 1
+) -> Iterator[tuple[tuple, Any]]:
+    """Yield ``(row, fn(*row))`` pairs as calls complete.
+
+    At most ``concurrency`` calls are in flight. Only ``fn`` runs on worker
+    threads, so the caller can consume results on its own thread and stay the
+    only user of its database connection.
+    """
+    row_iter = iter(rows)
+    pending = {}
+    max_workers = max(1, concurrency)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def submit_next():
+            try:
+                row = next(row_iter)
+            except StopIteration:
+                return
+            pending[executor.submit(fn, *row)] = row
+
+        for _ in range(max_workers):
+            submit_next()
+
+        while pending:
+            future = next(as_completed(pending))
+            row = pending.pop(future)
+            yield row, future.result()
+            submit_next()
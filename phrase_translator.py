@@ -2,13 +2,67 @@
 
 """Module for translating Greek phrases to English using LLM caching."""
 
+import json
 import os
-import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Dict
 
 from openai import OpenAI
 
+COMMIT_EVERY = 50
+LOOKUP_BATCH_SIZE = 500
+# Short JSON answer plus reasoning headroom for gpt-5-family models
+MAX_COMPLETION_TOKENS = 2048
+
+# Process-level LRU copy of committed phrase_translations rows, keyed on
+# phrase like the table itself (whichever model wrote a row, it is served).
+# The website build translates overlapping predictor lists many times per run.
+TRANSLATION_CACHE_SIZE = 20000
+_TRANSLATION_CACHE: "OrderedDict[str, tuple[str, bool]]" = OrderedDict()
+
+TRANSLATION_SYSTEM_PROMPT = """You are an expert in Ancient Greek who specializes in translating classical Greek texts.
+Translate the provided Greek word or phrase into clear, accurate English.
+Also determine if this is a proper noun (a name of a person, place, deity, or specific thing)."""
+
+TRANSLATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "phrase_translation",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "translation": {"type": "string"},
+                "is_proper_noun": {"type": "boolean"},
+            },
+            "required": ["translation", "is_proper_noun"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Hot-path statements; psycopg prepares them server-side once per connection
+SELECT_PHRASE_TRANSLATION_SQL = (
+    "SELECT english_translation, is_proper_noun FROM phrase_translations WHERE phrase = %s"
+)
+SELECT_PHRASE_TRANSLATIONS_SQL = (
+    "SELECT phrase, english_translation, is_proper_noun FROM phrase_translations "
+    "WHERE phrase = ANY(%s)"
+)
+UPSERT_PHRASE_TRANSLATION_SQL = """
+    INSERT INTO phrase_translations
+    (phrase, english_translation, is_proper_noun, timestamp, model, input_tokens, output_tokens)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (phrase) DO UPDATE SET
+        english_translation = EXCLUDED.english_translation,
+        is_proper_noun = EXCLUDED.is_proper_noun,
+        timestamp = EXCLUDED.timestamp,
+        model = EXCLUDED.model,
+        input_tokens = EXCLUDED.input_tokens,
+        output_tokens = EXCLUDED.output_tokens
+"""
+
 
 def create_phrase_translations_table(conn):
     """Create the phrase_translations table if it doesn't exist."""
@@ -16,16 +70,45 @@ def create_phrase_translations_table(conn):
     CREATE TABLE IF NOT EXISTS phrase_translations (
         phrase TEXT PRIMARY KEY,
         english_translation TEXT NOT NULL,
-        is_proper_noun BOOLEAN DEFAULT 0,
+        is_proper_noun BOOLEAN DEFAULT FALSE,
         timestamp TEXT NOT NULL,
         model TEXT NOT NULL,
         input_tokens INTEGER NOT NULL,
         output_tokens INTEGER NOT NULL
     )
     ''')
+    # Caches created before proper-noun tagging lack the column
+    conn.execute(
+        "ALTER TABLE phrase_translations ADD COLUMN IF NOT EXISTS is_proper_noun BOOLEAN DEFAULT FALSE"
+    )
     conn.commit()
 
 
+def clear_translation_cache():
+    """Forget translations remembered in this process."""
+    _TRANSLATION_CACHE.clear()
+
+
+def _cached_translation(phrase: str) -> Optional[tuple[str, bool]]:
+    translation = _TRANSLATION_CACHE.get(phrase)
+    if translation is not None:
+        _TRANSLATION_CACHE.move_to_end(phrase)
+    return translation
+
+
+def _remember_translations(translations: Dict[str, tuple[str, bool]]):
+    """Remember committed translations, evicting the least recently used.
+
+    Only call this once the rows are committed, so a rolled-back batch is
+    never served from memory.
+    """
+    for phrase, translation in translations.items():
+        _TRANSLATION_CACHE[phrase] = translation
+        _TRANSLATION_CACHE.move_to_end(phrase)
+    while len(_TRANSLATION_CACHE) > TRANSLATION_CACHE_SIZE:
+        _TRANSLATION_CACHE.popitem(last=False)
+
+
 def get_phrase_translation(conn, phrase: str) -> Optional[tuple[str, bool]]:
     """Get the English translation for a Greek phrase from the cache.
 
@@ -36,18 +119,50 @@ def get_phrase_translation(conn, phrase: str) -> Optional[tuple[str, bool]]:
     Returns:
         Tuple of (english_translation, is_proper_noun) if found, None otherwise
     """
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT english_translation, is_proper_noun FROM phrase_translations WHERE phrase = %s",
-        (phrase,)
-    )
-    result = cursor.fetchone()
-    return (result[0], bool(result[1])) if result else None
+    cached = _cached_translation(phrase)
+    if cached is not None:
+        return cached
+    result = conn.execute(SELECT_PHRASE_TRANSLATION_SQL, (phrase,), prepare=True).fetchone()
+    if not result:
+        return None
+    translation = (result[0], bool(result[1]))
+    _remember_translations({phrase: translation})
+    return translation
+
+
+def get_phrase_translations(conn, phrases: list[str]) -> Dict[str, tuple[str, bool]]:
+    """Get cached translations for many Greek phrases at once.
+
+    Args:
+        conn: Database connection
+        phrases: Greek phrases to look up
+
+    Returns:
+        Dictionary mapping each cached phrase to (english_translation, is_proper_noun);
+        phrases with no cached translation are absent
+    """
+    found = {}
+    missing = []
+    for phrase in phrases:
+        cached = _cached_translation(phrase)
+        if cached is not None:
+            found[phrase] = cached
+        else:
+            missing.append(phrase)
+    loaded = {}
+    for start in range(0, len(missing), LOOKUP_BATCH_SIZE):
+        batch = missing[start:start + LOOKUP_BATCH_SIZE]
+        rows = conn.execute(SELECT_PHRASE_TRANSLATIONS_SQL, (batch,), prepare=True).fetchall()
+        for phrase, translation, is_proper_noun in rows:
+            loaded[phrase] = (translation, bool(is_proper_noun))
+    _remember_translations(loaded)
+    found.update(loaded)
+    return found
 
 
 def save_phrase_translation(conn, phrase: str, translation: str, is_proper_noun: bool,
                            model: str, input_tokens: int, output_tokens: int):
-    """Save a phrase translation to the database.
+    """Save a phrase translation to the database without committing.
 
     Args:
         conn: Database connection
@@ -59,26 +174,14 @@ def save_phrase_translation(conn, phrase: str, translation: str, is_proper_noun:
         output_tokens: Number of output tokens generated
     """
     timestamp = datetime.now().isoformat()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO phrase_translations
-        (phrase, english_translation, is_proper_noun, timestamp, model, input_tokens, output_tokens)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (phrase) DO UPDATE SET
-            english_translation = EXCLUDED.english_translation,
-            is_proper_noun = EXCLUDED.is_proper_noun,
-            timestamp = EXCLUDED.timestamp,
-            model = EXCLUDED.model,
-            input_tokens = EXCLUDED.input_tokens,
-            output_tokens = EXCLUDED.output_tokens
-        """,
-        (phrase, translation, is_proper_noun, timestamp, model, input_tokens, output_tokens)
+    conn.execute(
+        UPSERT_PHRASE_TRANSLATION_SQL,
+        (phrase, translation, is_proper_noun, timestamp, model, input_tokens, output_tokens),
+        prepare=True,
     )
-    conn.commit()
 
 
-def translate_phrase(client: OpenAI, model: str, phrase: str) -> tuple[str, bool, int, int]:
+def translate_phrase(client: OpenAI, model: str, phrase: str) -> tuple[str, bool, int, int, Optional[str]]:
     """Translate a Greek phrase to English using the OpenAI API.
 
     Args:
@@ -87,58 +190,52 @@ def translate_phrase(client: OpenAI, model: str, phrase: str) -> tuple[str, bool
         phrase: Greek phrase to translate
 
     Returns:
-        Tuple of (translation, is_proper_noun, input_tokens, output_tokens)
+        Tuple of (translation, is_proper_noun, input_tokens, output_tokens, error).
+        Failures come back as error text for the caller to report, so this
+        is safe to run on worker threads.
     """
-    system_prompt = """You are an expert in Ancient Greek who specializes in translating classical Greek texts.
-Translate the provided Greek word or phrase into clear, accurate English.
-Also determine if this is a proper noun (a name of a person, place, deity, or specific thing).
-
-Respond in exactly this format:
-Translation: [your translation here]
-Proper Noun: [yes or no]"""
-
     try:
-        response = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
                 {"role": "user", "content": f"Translate this Ancient Greek word or phrase to English:\n\n{phrase}"}
-            ]
+            ],
+            response_format=TRANSLATION_RESPONSE_FORMAT,
+            max_completion_tokens=MAX_COMPLETION_TOKENS,
+            stream=True,
+            stream_options={"include_usage": True},
         )
 
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
-        content = response.choices[0].message.content.strip()
-
-        # Parse the response
-        translation = ""
-        is_proper_noun = False
-
-        for line in content.split('\n'):
-            line = line.strip()
-            if line.startswith('Translation:'):
-                translation = line.replace('Translation:', '').strip()
-            elif line.startswith('Proper Noun:'):
-                proper_noun_str = line.replace('Proper Noun:', '').strip().lower()
-                is_proper_noun = proper_noun_str in ['yes', 'true', '1']
-
-        return translation, is_proper_noun, input_tokens, output_tokens
+        # Usage arrives on the final chunk, which carries no choices
+        parts = []
+        input_tokens = output_tokens = 0
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            if chunk.usage:
+                input_tokens = chunk.usage.prompt_tokens
+                output_tokens = chunk.usage.completion_tokens
+        result = json.loads("".join(parts))
+        translation = result["translation"].strip()
+        is_proper_noun = bool(result["is_proper_noun"])
+
+        return translation, is_proper_noun, input_tokens, output_tokens, None
 
     except Exception as e:
-        print(f"Error translating phrase '{phrase}': {str(e)}")
-        return "", False, 0, 0
+        return "", False, 0, 0, str(e)
 
 
-def get_or_fetch_translation(conn, client: OpenAI, model: str, phrase: str,
-                             delay: float = 0.5) -> tuple[str, bool]:
+def get_or_fetch_translation(conn, client: OpenAI, model: str, phrase: str) -> tuple[str, bool]:
     """Get translation from cache or fetch from LLM if not available.
 
+    New translations are saved but not committed; the caller commits.
+
     Args:
         conn: Database connection
         client: OpenAI client
         model: Model name to use for new translations
         phrase: Greek phrase to translate
-        delay: Delay in seconds after API call to avoid rate limits
 
     Returns:
         Tuple of (english_translation, is_proper_noun)
@@ -148,20 +245,34 @@ def get_or_fetch_translation(conn, client: OpenAI, model: str, phrase: str,
     if cached:
         return cached
 
-    # Fetch from LLM
-    translation, is_proper_noun, input_tokens, output_tokens = translate_phrase(client, model, phrase)
+    return fetch_translation(conn, client, model, phrase)
+
+
+def fetch_translation(conn, client: OpenAI, model: str, phrase: str) -> tuple[str, bool]:
+    """Fetch a translation from the LLM and save it without committing.
+
+    Args:
+        conn: Database connection
+        client: OpenAI client
+        model: Model name to use
+        phrase: Greek phrase known to be missing from the cache
+
+    Returns:
+        Tuple of (english_translation, is_proper_noun)
+    """
+    translation, is_proper_noun, input_tokens, output_tokens, error = translate_phrase(client, model, phrase)
+    if error:
+        print(f"Error translating phrase '{phrase}': {error}")
 
     if translation:
         # Save to cache
         save_phrase_translation(conn, phrase, translation, is_proper_noun, model, input_tokens, output_tokens)
-        # Small delay to avoid rate limits
-        time.sleep(delay)
 
     return translation, is_proper_noun
 
 
 def get_translations_for_phrases(conn, client: Optional[OpenAI], model: str,
-                                 phrases: list[str], delay: float = 0.5) -> Dict[str, tuple[str, bool]]:
+                                 phrases: list[str]) -> Dict[str, tuple[str, bool]]:
     """Get translations for a list of phrases, fetching from LLM only when needed.
 
     Args:
@@ -169,7 +280,6 @@ def get_translations_for_phrases(conn, client: Optional[OpenAI], model: str,
         client: OpenAI client (None to only use cache)
         model: Model name to use for new translations
         phrases: List of Greek phrases to translate
-        delay: Delay in seconds after each API call
 
     Returns:
         Dictionary mapping phrases to tuples of (english_translation, is_proper_noun)
@@ -177,9 +287,13 @@ def get_translations_for_phrases(conn, client: Optional[OpenAI], model: str,
     translations = {}
     phrases_to_fetch = []
 
-    # First, get all cached translations
+    # Collapse repeats (keeping order) so each phrase is looked up and paid for once
+    phrases = list(dict.fromkeys(phrases))
+
+    # First, get all cached translations in bulk
+    cached_translations = get_phrase_translations(conn, phrases)
     for phrase in phrases:
-        cached = get_phrase_translation(conn, phrase)
+        cached = cached_translations.get(phrase)
         if cached:
             translations[phrase] = cached
         elif client is not None:
@@ -191,9 +305,23 @@ def get_translations_for_phrases(conn, client: Optional[OpenAI], model: str,
     # Fetch missing translations if client is available
     if client and phrases_to_fetch:
         print(f"Fetching {len(phrases_to_fetch)} new phrase translations from LLM...")
-        for phrase in phrases_to_fetch:
-            translation_tuple = get_or_fetch_translation(conn, client, model, phrase, delay)
-            translations[phrase] = translation_tuple
+        # Saved but uncommitted translations; remembered only after the commit
+        uncommitted = {}
+        try:
+            for count, phrase in enumerate(phrases_to_fetch, start=1):
+                translation_tuple = fetch_translation(conn, client, model, phrase)
+                translations[phrase] = translation_tuple
+                if translation_tuple[0]:
+                    uncommitted[phrase] = translation_tuple
+                if count % COMMIT_EVERY == 0:
+                    conn.commit()
+                    _remember_translations(uncommitted)
+                    uncommitted.clear()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        _remember_translations(uncommitted)
 
     return translations
 
@@ -4,15 +4,31 @@ import argparse
 import json
 import os
 import sys
-import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
 
-from openai import OpenAI
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
 from tqdm import tqdm
 
-from pausanias_db import add_database_argument, column_exists, connect
+from pausanias_db import (
+    add_database_argument,
+    column_exists,
+    connect,
+    count_rows,
+    stream_rows,
+)
+from pausanias_openai import (
+    add_rate_limit_argument,
+    create_openai_client,
+    create_rate_limiter,
+    map_concurrently,
+    rate_limited,
+)
 
 
 LEGACY_PROMPT_VERSION = "legacy-mythic-scepticism-v1"
@@ -22,6 +38,69 @@ DEFAULT_MODEL = "gpt-5"
 DEFAULT_COMPARISON_MODEL = "gpt-5.6-luna"
 DEFAULT_JUDGE_MODEL = "gpt-5.4"
 BUCKETS = ("mythic", "historical", "other")
+COMMIT_EVERY = 50
+# Below this many LLM-labelled sentences the prefilter is not trained
+PREFILTER_MIN_LABELLED = 2000
+# Recorded in greek_sentences.legacy_label_source; prefilter labels are kept
+# out of prefilter training and predictor analysis so neither learns from
+# the classifier's own output
+LEGACY_LABEL_SOURCE_LLM = "llm"
+LEGACY_LABEL_SOURCE_PREFILTER = "prefilter"
+
+LEGACY_SYSTEM_PROMPT = (
+    "Act as a Pausanias scholar and report whether this sentence of Pausanias is "
+    "a reference to the mythic era or historical era. Then report whether "
+    "Pausanias shows scepticism about the subject matter he is writing about."
+)
+LEGACY_BATCH_SYSTEM_PROMPT = (
+    "Act as a Pausanias scholar and report, for each numbered sentence of "
+    "Pausanias, whether it is a reference to the mythic era or historical "
+    "era. Then report whether Pausanias shows scepticism about the subject "
+    "matter he is writing about. Judge each sentence on its own."
+)
+GRETA_SYSTEM_PROMPT = (
+    "Act as a Pausanias scholar. Classify each sentence into exactly one "
+    "bucket. Use 'mythic' for mythic events or the impact of mythic events "
+    "on the landscape. Use 'historical' for events after roughly 500 BC or "
+    "the impact of those historical events on the landscape. Use 'other' "
+    "for geographical, route, descriptive, antiquarian, or otherwise "
+    "non-mythic/non-historical material that should not be forced into the "
+    "historical bucket. Also mark whether Pausanias expresses scepticism, "
+    "distance, doubt, correction, or explicit uncertainty."
+)
+GRETA_BOTH_SYSTEM_PROMPT = (
+    "Act as a Pausanias scholar. Mark two independent labels for each "
+    "sentence: references_mythic and references_historical. A sentence may "
+    "be mythic only, historical only, both mythic and historical, or neither. "
+    "Set references_mythic true for mythic or heroic events, mythic-era "
+    "genealogy, founder legend, heroic/Trojan/Heraclid tradition, oracle-linked "
+    "heroic relics, or the impact of mythic events and traditions on cult, "
+    "monuments, or landscape. Set references_historical true for events after "
+    "roughly 500 BC or their impact on landscape, cult, monuments, institutions, "
+    "dedications, athletic or artistic records, courts, politics, war, or "
+    "biography. Antiquarian detail can be mythic or historical when it carries "
+    "one of those functions; it is not automatically other. Do not classify a "
+    "bare mention of a deity, hero, sanctuary, statue, tomb, or route landmark "
+    "as mythic unless the sentence links it to a mythic tradition, event, "
+    "genealogy, or etiology. Do not classify early legendary or pre-500 Spartan, "
+    "Dorian, Heraclid, or heroic king-list material as historical merely because "
+    "it describes kings, colonies, or warfare. Set both flags false only for "
+    "pure route, geography, object description, or narrative transition with no "
+    "mythic or historical function. Do not classify scepticism."
+)
+JUDGE_SYSTEM_PROMPT = (
+    "You are judging two Pausanias sentence annotations. Choose the better "
+    "annotation, or tie if both are defensible. The label "
+    "references_mythic_era means the sentence references the mythic era, "
+    "not merely that it is non-historical. expresses_scepticism means "
+    "Pausanias distances, doubts, corrects, or questions the material."
+)
+
+UPDATE_LEGACY_ANALYSIS_SQL = """
+    UPDATE greek_sentences
+    SET references_mythic_era = %s, expresses_scepticism = %s, legacy_label_source = %s
+    WHERE passage_id = %s AND sentence_number = %s
+"""
 
 
 def now_iso():
@@ -104,14 +183,30 @@ def parse_arguments():
         "--concurrency",
         type=int,
         default=1,
-        help="Number of concurrent API calls for greta mode (default: 1)",
+        help="Number of concurrent API calls for legacy and greta modes (default: 1)",
     )
     parser.add_argument(
-        "--sleep-seconds",
+        "--batch-size",
+        type=int,
+        default=1,
+        help=(
+            "Number of sentences sent in each legacy-mode API call; larger "
+            "batches share one system prompt across sentences (default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--prefilter-confidence",
         type=float,
-        default=0.5,
-        help="Delay after each legacy/compare API call (default: 0.5)",
+        default=None,
+        help=(
+            "In legacy mode, label sentences with a TF-IDF/logistic-regression "
+            "model trained on existing legacy labels when both of its "
+            "probabilities reach this value, and call the API only for the "
+            "rest. Needs at least "
+            f"{PREFILTER_MIN_LABELLED} labelled sentences (default: off)"
+        ),
     )
+    add_rate_limit_argument(parser)
     return parser.parse_args()
 
 
@@ -141,6 +236,18 @@ def ensure_sentence_columns(conn):
         cursor.execute(
             "ALTER TABLE greek_sentences ADD COLUMN expresses_scepticism BOOLEAN"
         )
+    if not column_exists(conn, "greek_sentences", "legacy_label_source"):
+        cursor.execute(
+            "ALTER TABLE greek_sentences ADD COLUMN legacy_label_source TEXT"
+        )
+    # Legacy mode resumes from the untagged sentences; keep that an index scan
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_greek_sentences_unprocessed
+            ON greek_sentences (passage_id, sentence_number)
+            WHERE references_mythic_era IS NULL
+        """
+    )
     conn.commit()
 
 
@@ -331,8 +438,7 @@ def finish_run(
     conn.commit()
 
 
-def get_unprocessed_sentences(conn, limit=None):
-    """Retrieve sentences that have not been analysed in the legacy columns."""
+def unprocessed_sentences_query(limit=None):
     query = (
         "SELECT passage_id, sentence_number, sentence, english_sentence "
         "FROM greek_sentences "
@@ -341,11 +447,113 @@ def get_unprocessed_sentences(conn, limit=None):
     )
     if limit:
         query += f" LIMIT {int(limit)}"
+    return query
+
+
+def count_unprocessed_sentences(conn, limit=None):
+    """Count sentences that have not been analysed in the legacy columns."""
+    return count_rows(conn, unprocessed_sentences_query(limit))
+
+
+def get_unprocessed_sentences(conn, limit=None):
+    """Stream sentences that have not been analysed in the legacy columns."""
+    return stream_rows(conn, unprocessed_sentences_query(limit))
+
+
+def get_legacy_training_sentences(conn):
+    """Retrieve sentences whose two legacy labels came from the model, not the prefilter."""
     with conn.cursor() as cursor:
-        cursor.execute(query)
+        cursor.execute(
+            """
+            SELECT sentence, english_sentence, references_mythic_era, expresses_scepticism
+            FROM greek_sentences
+            WHERE references_mythic_era IS NOT NULL
+              AND expresses_scepticism IS NOT NULL
+              AND legacy_label_source IS DISTINCT FROM %s
+            """,
+            (LEGACY_LABEL_SOURCE_PREFILTER,),
+        )
         return cursor.fetchall()
 
 
+def prefilter_text(sentence_text, english_text):
+    return f"{sentence_text}\n{english_text}"
+
+
+def train_legacy_prefilter(training_rows):
+    """Fit one TF-IDF + logistic regression head per legacy label.
+
+    Returns (mythic_head, scepticism_head), or None when either label has
+    only one class in the training rows.
+    """
+    texts = [prefilter_text(sentence, english) for sentence, english, _, _ in training_rows]
+    heads = []
+    for label_index in (2, 3):
+        labels = [bool(row[label_index]) for row in training_rows]
+        if len(set(labels)) < 2:
+            return None
+        pipeline = Pipeline([
+            ("tfidf", TfidfVectorizer(sublinear_tf=True)),
+            ("logreg", LogisticRegression(max_iter=1000)),
+        ])
+        pipeline.fit(texts, labels)
+        heads.append(pipeline)
+    return tuple(heads)
+
+
+def prefilter_legacy_sentences(heads, rows, confidence):
+    """Split sentence rows into confident local labels and rows for the API.
+
+    Returns (labelled, remaining) where labelled holds
+    (passage_id, sentence_number, references_mythic_era, expresses_scepticism).
+    """
+    if not rows:
+        return [], []
+    texts = [prefilter_text(sentence, english) for _, _, sentence, english in rows]
+    mythic_head, scepticism_head = heads
+    mythic_proba = mythic_head.predict_proba(texts)
+    scepticism_proba = scepticism_head.predict_proba(texts)
+    labelled = []
+    remaining = []
+    for row, mythic, scepticism in zip(rows, mythic_proba, scepticism_proba):
+        if mythic.max() >= confidence and scepticism.max() >= confidence:
+            labelled.append(
+                (
+                    row[0],
+                    row[1],
+                    bool(mythic_head.classes_[mythic.argmax()]),
+                    bool(scepticism_head.classes_[scepticism.argmax()]),
+                )
+            )
+        else:
+            remaining.append(row)
+    return labelled, remaining
+
+
+def apply_legacy_prefilter(conn, sentences, confidence):
+    """Save confident prefilter labels and return the sentences still needing the API."""
+    training_rows = get_legacy_training_sentences(conn)
+    if len(training_rows) < PREFILTER_MIN_LABELLED:
+        print(
+            f"Prefilter skipped: {len(training_rows)} labelled sentences, "
+            f"need {PREFILTER_MIN_LABELLED}."
+        )
+        return sentences
+    heads = train_legacy_prefilter(training_rows)
+    if heads is None:
+        print("Prefilter skipped: a legacy label has only one class.")
+        return sentences
+    labelled, remaining = prefilter_legacy_sentences(heads, sentences, confidence)
+    if labelled:
+        save_legacy_analysis_batch(conn, labelled, source=LEGACY_LABEL_SOURCE_PREFILTER)
+        conn.commit()
+    print(
+        f"Prefilter labelled {len(labelled)} sentences locally; "
+        f"{len(remaining)} go to the API."
+    )
+    return remaining
+
+
 def get_legacy_comparison_sample(conn, limit):
     """Retrieve a deterministic sample of already-tagged legacy sentences."""
     with conn.cursor() as cursor:
@@ -356,10 +564,11 @@ def get_legacy_comparison_sample(conn, limit):
             FROM greek_sentences
             WHERE references_mythic_era IS NOT NULL
               AND expresses_scepticism IS NOT NULL
+              AND legacy_label_source IS DISTINCT FROM %s
             ORDER BY md5(passage_id || ':' || sentence_number::text)
             LIMIT %s
             """,
-            (limit,),
+            (LEGACY_LABEL_SOURCE_PREFILTER, limit),
         )
         return cursor.fetchall()
 
@@ -425,18 +634,30 @@ def get_greta_both_unprocessed_sentences(conn, prompt_version, excluded_books, l
 
 
 def save_legacy_analysis_results(
-    conn, passage_id, sentence_number, references_mythic_era, expresses_scepticism
+    conn,
+    passage_id,
+    sentence_number,
+    references_mythic_era,
+    expresses_scepticism,
+    source=LEGACY_LABEL_SOURCE_LLM,
 ):
-    """Persist legacy boolean analysis results for a sentence."""
+    """Persist legacy boolean analysis results for a sentence; the caller commits."""
     conn.execute(
-        """
-        UPDATE greek_sentences
-        SET references_mythic_era = %s, expresses_scepticism = %s
-        WHERE passage_id = %s AND sentence_number = %s
-        """,
-        (references_mythic_era, expresses_scepticism, passage_id, sentence_number),
+        UPDATE_LEGACY_ANALYSIS_SQL,
+        (references_mythic_era, expresses_scepticism, source, passage_id, sentence_number),
+        prepare=True,
+    )
+
+
+def save_legacy_analysis_batch(conn, results, source=LEGACY_LABEL_SOURCE_LLM):
+    """Persist many (passage_id, sentence_number, mythic, scepticism) results; the caller commits."""
+    conn.cursor().executemany(
+        UPDATE_LEGACY_ANALYSIS_SQL,
+        [
+            (references_mythic_era, expresses_scepticism, source, passage_id, sentence_number)
+            for passage_id, sentence_number, references_mythic_era, expresses_scepticism in results
+        ],
     )
-    conn.commit()
 
 
 def legacy_tool():
@@ -474,6 +695,42 @@ def legacy_tool():
     ]
 
 
+def legacy_batch_tool():
+    annotation = legacy_tool()[0]["function"]["parameters"]
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": "save_annotations_batch",
+                "description": (
+                    "Save, for each numbered sentence, whether it references the "
+                    "mythic era and whether Pausanias expresses skepticism."
+                ),
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "annotations": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "item": {
+                                        "type": "integer",
+                                        "description": "The number of the sentence in the request.",
+                                    },
+                                    **annotation["properties"],
+                                },
+                                "required": ["item", *annotation["required"]],
+                            },
+                        },
+                    },
+                    "required": ["annotations"],
+                },
+            },
+        }
+    ]
+
+
 def greta_tool():
     return [
         {
@@ -582,11 +839,6 @@ def analyse_sentence_legacy(
     client, model, passage_id, sentence_number, sentence_text, english_text
 ):
     """Analyse a sentence using the legacy two-boolean schema."""
-    system_prompt = (
-        "Act as a Pausanias scholar and report whether this sentence of Pausanias is "
-        "a reference to the mythic era or historical era. Then report whether "
-        "Pausanias shows scepticism about the subject matter he is writing about."
-    )
     user_content = (
         f"Passage {passage_id}, sentence {sentence_number}:\n\n"
         f"Greek:\n{sentence_text}\n\nEnglish:\n{english_text}\n\n"
@@ -597,7 +849,7 @@ def analyse_sentence_legacy(
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": LEGACY_SYSTEM_PROMPT},
                 {"role": "user", "content": user_content},
             ],
             tools=legacy_tool(),
@@ -633,20 +885,81 @@ def analyse_sentence_legacy(
         }
 
 
+def analyse_sentences_legacy(client, model, rows):
+    """Analyse several sentences in one call using the legacy two-boolean schema.
+
+    ``rows`` are (passage_id, sentence_number, sentence, english_sentence)
+    tuples. Returns (row, result) pairs with results shaped like
+    ``analyse_sentence_legacy``; the call's token usage is reported on the
+    first sentence so run totals stay correct.
+    """
+    if len(rows) == 1:
+        return [(rows[0], analyse_sentence_legacy(client, model, *rows[0]))]
+
+    user_content = "\n\n".join(
+        f"Sentence {item} (passage {passage_id}, sentence {sentence_number}):\n"
+        f"Greek:\n{sentence_text}\nEnglish:\n{english_text}"
+        for item, (passage_id, sentence_number, sentence_text, english_text) in enumerate(
+            rows, start=1
+        )
+    )
+    user_content += (
+        "\n\nAnalyse every numbered sentence and provide your results using the "
+        "save_annotations_batch function."
+    )
+
+    input_tokens = output_tokens = 0
+    annotations = {}
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": LEGACY_BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": user_content},
+            ],
+            tools=legacy_batch_tool(),
+            tool_choice={"type": "function", "function": {"name": "save_annotations_batch"}},
+        )
+        input_tokens = response.usage.prompt_tokens
+        output_tokens = response.usage.completion_tokens
+        tool_calls = response.choices[0].message.tool_calls
+        if tool_calls:
+            function_args = json.loads(tool_calls[0].function.arguments)
+            annotations = {
+                annotation.get("item"): annotation
+                for annotation in function_args.get("annotations", [])
+            }
+            error = "No annotation returned for this sentence"
+        else:
+            error = "No tool call returned"
+    except Exception as exc:
+        error = str(exc)
+
+    results = []
+    for item, row in enumerate(rows, start=1):
+        annotation = annotations.get(item, {})
+        references_mythic_era = annotation.get("references_mythic_era")
+        expresses_scepticism = annotation.get("expresses_scepticism")
+        labelled = references_mythic_era is not None and expresses_scepticism is not None
+        results.append(
+            (
+                row,
+                {
+                    "references_mythic_era": references_mythic_era,
+                    "expresses_scepticism": expresses_scepticism,
+                    "input_tokens": input_tokens if item == 1 else 0,
+                    "output_tokens": output_tokens if item == 1 else 0,
+                    "error": None if labelled else error,
+                },
+            )
+        )
+    return results
+
+
 def analyse_sentence_greta(
     client, model, passage_id, sentence_number, sentence_text, english_text
 ):
     """Analyse a sentence using Greta's mythic/historical/other tagging plan."""
-    system_prompt = (
-        "Act as a Pausanias scholar. Classify each sentence into exactly one "
-        "bucket. Use 'mythic' for mythic events or the impact of mythic events "
-        "on the landscape. Use 'historical' for events after roughly 500 BC or "
-        "the impact of those historical events on the landscape. Use 'other' "
-        "for geographical, route, descriptive, antiquarian, or otherwise "
-        "non-mythic/non-historical material that should not be forced into the "
-        "historical bucket. Also mark whether Pausanias expresses scepticism, "
-        "distance, doubt, correction, or explicit uncertainty."
-    )
     user_content = (
         f"Passage {passage_id}, sentence {sentence_number}:\n\n"
         f"Greek:\n{sentence_text}\n\nEnglish:\n{english_text}\n\n"
@@ -657,7 +970,7 @@ def analyse_sentence_greta(
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": GRETA_SYSTEM_PROMPT},
                 {"role": "user", "content": user_content},
             ],
             tools=greta_tool(),
@@ -685,26 +998,6 @@ def analyse_sentence_greta_both(
     client, model, passage_id, sentence_number, sentence_text, english_text
 ):
     """Analyse a sentence using independent mythic and historical flags."""
-    system_prompt = (
-        "Act as a Pausanias scholar. Mark two independent labels for each "
-        "sentence: references_mythic and references_historical. A sentence may "
-        "be mythic only, historical only, both mythic and historical, or neither. "
-        "Set references_mythic true for mythic or heroic events, mythic-era "
-        "genealogy, founder legend, heroic/Trojan/Heraclid tradition, oracle-linked "
-        "heroic relics, or the impact of mythic events and traditions on cult, "
-        "monuments, or landscape. Set references_historical true for events after "
-        "roughly 500 BC or their impact on landscape, cult, monuments, institutions, "
-        "dedications, athletic or artistic records, courts, politics, war, or "
-        "biography. Antiquarian detail can be mythic or historical when it carries "
-        "one of those functions; it is not automatically other. Do not classify a "
-        "bare mention of a deity, hero, sanctuary, statue, tomb, or route landmark "
-        "as mythic unless the sentence links it to a mythic tradition, event, "
-        "genealogy, or etiology. Do not classify early legendary or pre-500 Spartan, "
-        "Dorian, Heraclid, or heroic king-list material as historical merely because "
-        "it describes kings, colonies, or warfare. Set both flags false only for "
-        "pure route, geography, object description, or narrative transition with no "
-        "mythic or historical function. Do not classify scepticism."
-    )
     user_content = (
         f"Passage {passage_id}, sentence {sentence_number}:\n\n"
         f"Greek:\n{sentence_text}\n\nEnglish:\n{english_text}\n\n"
@@ -715,7 +1008,7 @@ def analyse_sentence_greta_both(
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": GRETA_BOTH_SYSTEM_PROMPT},
                 {"role": "user", "content": user_content},
             ],
             tools=greta_both_tool(),
@@ -778,13 +1071,6 @@ def judge_legacy_discrepancy(
             },
         }
     ]
-    system_prompt = (
-        "You are judging two Pausanias sentence annotations. Choose the better "
-        "annotation, or tie if both are defensible. The label "
-        "references_mythic_era means the sentence references the mythic era, "
-        "not merely that it is non-historical. expresses_scepticism means "
-        "Pausanias distances, doubts, corrects, or questions the material."
-    )
     user_content = (
         f"Passage {passage_id}, sentence {sentence_number}:\n\n"
         f"Greek:\n{sentence_text}\n\nEnglish:\n{english_text}\n\n"
@@ -795,7 +1081,7 @@ def judge_legacy_discrepancy(
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": JUDGE_SYSTEM_PROMPT},
                 {"role": "user", "content": user_content},
             ],
             tools=tool,
@@ -982,43 +1268,78 @@ def save_greta_both_tag(
 
 def run_legacy_mode(args, conn, client):
     ensure_sentence_columns(conn)
-    sentences = get_unprocessed_sentences(conn, args.stop_after)
-    if not sentences:
+    sentence_count = count_unprocessed_sentences(conn, args.stop_after)
+    if not sentence_count:
         print("No unprocessed sentences found in the database.")
         return
-    print(f"Found {len(sentences)} unprocessed sentences.")
-    iterator = tqdm(sentences) if args.progress_bar else sentences
+    print(f"Found {sentence_count} unprocessed sentences.")
+    sentences = get_unprocessed_sentences(conn, args.stop_after)
+    if args.prefilter_confidence is not None:
+        sentences = apply_legacy_prefilter(conn, list(sentences), args.prefilter_confidence)
+        sentence_count = len(sentences)
+        sentences = iter(sentences)
+    progress = tqdm(total=sentence_count) if args.progress_bar else None
     total_input_tokens = 0
     total_output_tokens = 0
-    for passage_id, sentence_number, sentence_text, english_text in iterator:
-        result = analyse_sentence_legacy(
-            client, args.model, passage_id, sentence_number, sentence_text, english_text
-        )
-        total_input_tokens += result["input_tokens"]
-        total_output_tokens += result["output_tokens"]
-        if (
-            result["references_mythic_era"] is not None
-            and result["expresses_scepticism"] is not None
-        ):
-            save_legacy_analysis_results(
-                conn,
-                passage_id,
-                sentence_number,
-                result["references_mythic_era"],
-                result["expresses_scepticism"],
-            )
-            if not args.progress_bar:
-                print(
-                    f"Processed {passage_id} #{sentence_number}: "
-                    f"mythic_era={result['references_mythic_era']}, "
-                    f"scepticism={result['expresses_scepticism']}, "
-                    f"tokens={result['input_tokens']}/{result['output_tokens']}"
-                )
-        else:
-            print(
-                f"Failed to analyse {passage_id} #{sentence_number}: {result['error']}"
-            )
-        time.sleep(args.sleep_seconds)
+    batch_size = max(1, args.batch_size)
+    batches = ((batch,) for batch in iter(lambda: list(islice(sentences, batch_size)), []))
+    analyse = rate_limited(
+        partial(analyse_sentences_legacy, client, args.model),
+        create_rate_limiter(args.requests_per_minute),
+    )
+
+    completed = 0
+    committed = 0
+    try:
+        for _, results in map_concurrently(analyse, batches, args.concurrency):
+            labelled = []
+            for (passage_id, sentence_number, _, _), result in results:
+                total_input_tokens += result["input_tokens"]
+                total_output_tokens += result["output_tokens"]
+                if (
+                    result["references_mythic_era"] is not None
+                    and result["expresses_scepticism"] is not None
+                ):
+                    labelled.append(
+                        (
+                            passage_id,
+                            sentence_number,
+                            result["references_mythic_era"],
+                            result["expresses_scepticism"],
+                        )
+                    )
+                    if not args.progress_bar:
+                        print(
+                            f"Processed {passage_id} #{sentence_number}: "
+                            f"mythic_era={result['references_mythic_era']}, "
+                            f"scepticism={result['expresses_scepticism']}, "
+                            f"tokens={result['input_tokens']}/{result['output_tokens']}"
+                        )
+                else:
+                    message = (
+                        f"Failed to analyse {passage_id} #{sentence_number}: {result['error']}"
+                    )
+                    if progress is not None:
+                        progress.write(message)
+                    else:
+                        print(message)
+            if labelled:
+                save_legacy_analysis_batch(conn, labelled)
+            # Commit in batches rather than once per sentence
+            completed += len(results)
+            if completed - committed >= COMMIT_EVERY:
+                conn.commit()
+                committed = completed
+            if progress is not None:
+                progress.update(len(results))
+        conn.commit()
+    except Exception:
+        # Committing now would fail inside the aborted transaction and hide the error
+        conn.rollback()
+        raise
+
+    if progress is not None:
+        progress.close()
     print(
         "Processing complete. Total tokens used: "
         f"{total_input_tokens} input, {total_output_tokens} output"
@@ -1045,6 +1366,9 @@ def run_compare_mode(args, conn, client):
     total_output_tokens = 0
     discrepancy_count = 0
     judge_counts = {"baseline": 0, "comparison": 0, "tie": 0, "failed": 0}
+    rate_limiter = create_rate_limiter(args.requests_per_minute)
+    analyse = rate_limited(analyse_sentence_legacy, rate_limiter)
+    judge = rate_limited(judge_legacy_discrepancy, rate_limiter)
 
     try:
         for row in rows:
@@ -1056,7 +1380,7 @@ def run_compare_mode(args, conn, client):
                 baseline_mythic,
                 baseline_scepticism,
             ) = row
-            comparison = analyse_sentence_legacy(
+            comparison = analyse(
                 client,
                 args.comparison_model,
                 passage_id,
@@ -1088,7 +1412,7 @@ def run_compare_mode(args, conn, client):
                     judge_reason,
                     judge_input_tokens,
                     judge_output_tokens,
-                ) = judge_legacy_discrepancy(
+                ) = judge(
                     client,
                     args.judge_model,
                     passage_id,
@@ -1122,7 +1446,6 @@ def run_compare_mode(args, conn, client):
             )
             status = "DIFF" if disagrees else "same"
             print(f"{status} {passage_id} #{sentence_number}")
-            time.sleep(args.sleep_seconds)
 
         notes = (
             f"judge_counts={judge_counts}; total_tokens="
@@ -1198,6 +1521,8 @@ def run_greta_mode(args, conn, client):
     max_workers = max(1, args.concurrency)
     stop_submitting = False
 
+    analyse = rate_limited(analyse_sentence_greta, create_rate_limiter(args.requests_per_minute))
+
     def submit_next(executor):
         try:
             row = next(row_iter)
@@ -1205,7 +1530,7 @@ def run_greta_mode(args, conn, client):
             return False
         passage_id, sentence_number, sentence_text, english_text = row
         future = executor.submit(
-            analyse_sentence_greta,
+            analyse,
             client,
             args.model,
             passage_id,
@@ -1332,6 +1657,8 @@ def run_greta_both_mode(args, conn, client):
     max_workers = max(1, args.concurrency)
     stop_submitting = False
 
+    analyse = rate_limited(analyse_sentence_greta_both, create_rate_limiter(args.requests_per_minute))
+
     def submit_next(executor):
         try:
             row = next(row_iter)
@@ -1339,7 +1666,7 @@ def run_greta_both_mode(args, conn, client):
             return False
         passage_id, sentence_number, sentence_text, english_text = row
         future = executor.submit(
-            analyse_sentence_greta_both,
+            analyse,
             client,
             args.model,
             passage_id,
@@ -1426,8 +1753,8 @@ def run_greta_both_mode(args, conn, client):
 def main():
     args = parse_arguments()
     api_key = load_openai_api_key(args.openai_api_key_file)
-    client = OpenAI(api_key=api_key)
-    conn = connect(args.database_url)
+    client = create_openai_client(api_key)
+    conn = connect(args.database_url, bulk_writes=True)
     try:
         if args.mode == "legacy":
             run_legacy_mode(args, conn, client)
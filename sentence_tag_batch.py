@@ -1269,7 +1269,8 @@ WITH legacy_rows(
 )
 UPDATE greek_sentences s
 SET references_mythic_era = legacy_rows.references_mythic_era,
-    expresses_scepticism = legacy_rows.expresses_scepticism
+    expresses_scepticism = legacy_rows.expresses_scepticism,
+    legacy_label_source = 'llm'
 FROM legacy_rows
 WHERE s.passage_id = legacy_rows.passage_id
   AND s.sentence_number = legacy_rows.sentence_number;
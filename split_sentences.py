@@ -5,12 +5,71 @@ import json
 import os
 import re
 import sys
-import time
+from functools import partial
 
-from openai import OpenAI
 from tqdm import tqdm
 
-from pausanias_db import add_database_argument, connect
+from pausanias_db import add_database_argument, connect, count_rows, stream_rows
+from pausanias_openai import (
+    add_rate_limit_argument,
+    create_openai_client,
+    create_rate_limiter,
+    map_concurrently,
+    rate_limited,
+)
+
+COMMIT_EVERY = 50
+UPSERT_SENTENCE_SQL = """
+    INSERT INTO greek_sentences (passage_id, sentence_number, sentence, english_sentence)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (passage_id, sentence_number) DO UPDATE SET
+        sentence = EXCLUDED.sentence,
+        english_sentence = EXCLUDED.english_sentence
+"""
+
+SPLIT_SYSTEM_PROMPT = (
+    "You are an expert in Ancient Greek punctuation and a skilled English editor. "
+    "Split the original Greek passage and its English translation into aligned "
+    "sentence-level pairs. The Greek and English arrays must have exactly the "
+    "same number of items, and all text must appear exactly once in order. "
+    "Prefer the English translation's full-sentence boundaries: when the "
+    "English has separate full sentences, split the Greek at the closest Greek "
+    "sentence punctuation or strong internal punctuation so the pairs align. "
+    "Do not split English into fragments; avoid output items that end with a "
+    "dash or that cannot stand as a sentence. Greek middle dot, semicolon, and "
+    "colon may be a sentence boundary when both sides are complete clauses or "
+    "when needed to align with a full English sentence; otherwise keep them internal."
+)
+
+SPLIT_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "record_sentences",
+            "description": "Store Greek and English sentences",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "greek_sentences": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                    },
+                    "english_sentences": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                    },
+                },
+                "required": ["greek_sentences", "english_sentences"],
+            },
+        },
+    }
+]
+
+# English items that open like a continuation of the previous sentence
+FRAGMENT_STARTER_RE = re.compile(
+    r"^(and|but|or|nor|for|so|yet|while|that|which|who|whom|whose|from|to|of|by)\b",
+    re.IGNORECASE,
+)
 
 
 def parse_arguments():
@@ -53,6 +112,13 @@ def parse_arguments():
         default=False,
         help="Print the full API response for debugging",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of concurrent API calls (default: 1)",
+    )
+    add_rate_limit_argument(parser)
     return parser.parse_args()
 
 
@@ -84,9 +150,7 @@ def create_sentences_table(conn):
     conn.commit()
 
 
-def get_unsplit_passages(conn, limit=None):
-    """Retrieve passages with translations that haven't been split yet."""
-    cursor = conn.cursor()
+def unsplit_passages_query(limit=None):
     query = """
     SELECT p.id, p.passage, t.english_translation
     FROM passages p
@@ -96,54 +160,31 @@ def get_unsplit_passages(conn, limit=None):
     ORDER BY p.id
     """
     if limit:
-        query += f" LIMIT {limit}"
-    cursor.execute(query)
-    return cursor.fetchall()
+        query += f" LIMIT {int(limit)}"
+    return query
+
+
+def count_unsplit_passages(conn, limit=None):
+    """Count passages with translations that haven't been split yet."""
+    return count_rows(conn, unsplit_passages_query(limit))
+
+
+def get_unsplit_passages(conn, limit=None):
+    """Stream passages with translations that haven't been split yet."""
+    return stream_rows(conn, unsplit_passages_query(limit))
 
 
 def split_passage(client, model, passage_id, passage_text, translation, debug=False):
-    """Use the OpenAI API to split a passage and its translation into sentences."""
-    system_prompt = (
-        "You are an expert in Ancient Greek punctuation and a skilled English editor. "
-        "Split the original Greek passage and its English translation into aligned "
-        "sentence-level pairs. The Greek and English arrays must have exactly the "
-        "same number of items, and all text must appear exactly once in order. "
-        "Prefer the English translation's full-sentence boundaries: when the "
-        "English has separate full sentences, split the Greek at the closest Greek "
-        "sentence punctuation or strong internal punctuation so the pairs align. "
-        "Do not split English into fragments; avoid output items that end with a "
-        "dash or that cannot stand as a sentence. Greek middle dot, semicolon, and "
-        "colon may be a sentence boundary when both sides are complete clauses or "
-        "when needed to align with a full English sentence; otherwise keep them internal."
-    )
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "record_sentences",
-                "description": "Store Greek and English sentences",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "greek_sentences": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                        },
-                        "english_sentences": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                        },
-                    },
-                    "required": ["greek_sentences", "english_sentences"],
-                },
-            },
-        }
-    ]
+    """Use the OpenAI API to split a passage and its translation into sentences.
+
+    Returns (greek_sentences, english_sentences, error). This runs on worker
+    threads, so failures come back as error text rather than being printed.
+    """
     try:
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SPLIT_SYSTEM_PROMPT},
                 {
                     "role": "user",
                     "content": (
@@ -153,7 +194,7 @@ def split_passage(client, model, passage_id, passage_text, translation, debug=Fa
                     ),
                 },
             ],
-            tools=tools,
+            tools=SPLIT_TOOLS,
             tool_choice={"type": "function", "function": {"name": "record_sentences"}},
         )
         if debug:
@@ -165,13 +206,11 @@ def split_passage(client, model, passage_id, passage_text, translation, debug=Fa
             function_args = json.loads(tool_calls[0].function.arguments)
             greek_sentences = [s.strip() for s in function_args.get("greek_sentences", []) if s.strip()]
             english_sentences = [s.strip() for s in function_args.get("english_sentences", []) if s.strip()]
-            return greek_sentences, english_sentences
+            return greek_sentences, english_sentences, None
         else:
-            print(f"No tool call returned for passage {passage_id}")
-            return [], []
+            return [], [], "no tool call in the response"
     except Exception as e:
-        print(f"Error splitting passage {passage_id}: {e}")
-        return [], []
+        return [], [], str(e)
 
 
 def validate_sentence_split(greek_sentences, english_sentences):
@@ -184,80 +223,89 @@ def validate_sentence_split(greek_sentences, english_sentences):
             f"Greek/English count mismatch: {len(greek_sentences)} vs {len(english_sentences)}",
         )
 
-    fragment_starters = re.compile(
-        r"^(and|but|or|nor|for|so|yet|while|that|which|who|whom|whose|from|to|of|by)\b",
-        re.IGNORECASE,
-    )
     for index, sentence in enumerate(english_sentences):
         cleaned = sentence.strip()
         if not cleaned:
             return False, f"empty English sentence at index {index + 1}"
         if cleaned.endswith(("—", "–", "-")):
             return False, f"English fragment ends with dash at index {index + 1}"
-        if index > 0 and sentence[:1].islower() and fragment_starters.match(cleaned):
+        if index > 0 and sentence[:1].islower() and FRAGMENT_STARTER_RE.match(cleaned):
             return False, f"English continuation fragment at index {index + 1}: {cleaned[:40]}"
 
     return True, ""
 
 
+def split_passage_with_fallback(
+    client, model, fallback_model, passage_id, passage_text, translation, debug=False
+):
+    """Split a passage, retrying once with the fallback model if the split is invalid.
+
+    Returns (greek_sentences, english_sentences, is_valid, reason,
+    primary_reason), where primary_reason says why the primary split was
+    retried (None if it wasn't), for the main loop to report.
+    """
+    greek_sentences, english_sentences, error = split_passage(
+        client, model, passage_id, passage_text, translation, debug
+    )
+    is_valid, reason = validate_sentence_split(greek_sentences, english_sentences)
+    reason = error or reason
+    primary_reason = None
+    if not is_valid and fallback_model and fallback_model != model:
+        primary_reason = reason
+        greek_sentences, english_sentences, error = split_passage(
+            client, fallback_model, passage_id, passage_text, translation, debug
+        )
+        is_valid, reason = validate_sentence_split(greek_sentences, english_sentences)
+        reason = error or reason
+    return greek_sentences, english_sentences, is_valid, reason, primary_reason
+
+
 def save_sentences(conn, passage_id, greek_sentences, english_sentences):
-    """Save the list of Greek and English sentences for a passage."""
+    """Save the list of Greek and English sentences for a passage; the caller commits."""
     is_valid, reason = validate_sentence_split(greek_sentences, english_sentences)
     if not is_valid:
         raise ValueError(f"Refusing to save invalid sentence split for {passage_id}: {reason}")
 
-    cursor = conn.cursor()
-    for idx, (gr, en) in enumerate(zip(greek_sentences, english_sentences), start=1):
-        cursor.execute(
-            """
-        INSERT INTO greek_sentences (passage_id, sentence_number, sentence, english_sentence)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT (passage_id, sentence_number) DO UPDATE SET
-            sentence = EXCLUDED.sentence,
-            english_sentence = EXCLUDED.english_sentence
-            """,
-            (passage_id, idx, gr, en),
-        )
-    conn.commit()
+    rows = [
+        (passage_id, idx, gr, en)
+        for idx, (gr, en) in enumerate(zip(greek_sentences, english_sentences), start=1)
+    ]
+    conn.cursor().executemany(UPSERT_SENTENCE_SQL, rows)
 
 
 def main():
     args = parse_arguments()
     api_key = load_openai_api_key(args.openai_api_key_file)
-    client = OpenAI(api_key=api_key)
-    conn = connect(args.database_url)
+    client = create_openai_client(api_key)
+    conn = connect(args.database_url, bulk_writes=True)
     try:
         create_sentences_table(conn)
-        passages = get_unsplit_passages(conn, args.stop_after)
-        if not passages:
+        passage_count = count_unsplit_passages(conn, args.stop_after)
+        if not passage_count:
             print("No unsplit passages found in the database.")
             return
-        print(f"Found {len(passages)} unsplit passages.")
-        iterator = tqdm(passages) if args.progress_bar else passages
-        for passage_id, passage_text, translation in iterator:
-            greek_sentences, english_sentences = split_passage(
-                client, args.model, passage_id, passage_text, translation, args.debug
-            )
-            is_valid, reason = validate_sentence_split(greek_sentences, english_sentences)
-            if (
-                not is_valid
-                and args.fallback_model
-                and args.fallback_model != args.model
-            ):
-                print(
+        print(f"Found {passage_count} unsplit passages.")
+        passages = get_unsplit_passages(conn, args.stop_after)
+        progress = tqdm(total=passage_count) if args.progress_bar else None
+        # Messages that must still appear under --progress-bar go through
+        # tqdm.write so they don't tear the bar
+        report = progress.write if progress is not None else print
+        split = partial(
+            split_passage_with_fallback,
+            client,
+            args.model,
+            args.fallback_model,
+            debug=args.debug,
+        )
+        split = rate_limited(split, create_rate_limiter(args.requests_per_minute))
+        results = map_concurrently(split, passages, args.concurrency)
+        for count, ((passage_id, _, _), result) in enumerate(results, start=1):
+            greek_sentences, english_sentences, is_valid, reason, primary_reason = result
+            if primary_reason:
+                report(
                     f"Primary split for passage {passage_id} using {args.model} was invalid "
-                    f"({reason}); retrying with {args.fallback_model}."
+                    f"({primary_reason}); retried with {args.fallback_model}."
                 )
-                greek_sentences, english_sentences = split_passage(
-                    client,
-                    args.fallback_model,
-                    passage_id,
-                    passage_text,
-                    translation,
-                    args.debug,
-                )
-                is_valid, reason = validate_sentence_split(greek_sentences, english_sentences)
-
             if is_valid:
                 save_sentences(conn, passage_id, greek_sentences, english_sentences)
                 if not args.progress_bar:
@@ -265,9 +313,18 @@ def main():
                         f"Processed passage {passage_id}, extracted {len(greek_sentences)} sentences."
                     )
             else:
-                print(f"Failed to split passage {passage_id}: {reason}")
-            time.sleep(0.5)
+                report(f"Failed to split passage {passage_id}: {reason}")
+            # Commit in batches; each passage's sentences share a transaction
+            if count % COMMIT_EVERY == 0:
+                conn.commit()
+            if progress is not None:
+                progress.update()
+        conn.commit()
+        if progress is not None:
+            progress.close()
     except Exception as e:
+        # Committing now would fail inside the aborted transaction and hide e
+        conn.rollback()
         print(f"Error: {e}")
         sys.exit(1)
     finally:
@@ -3,28 +3,29 @@ from scipy.stats import fisher_exact, chi2
 
 def compute_p_q_values(pos_counts, neg_counts, total_pos, total_neg):
     """Compute p-values and Benjamini-Hochberg corrected q-values."""
-    p_values = []
-    for a, b in zip(pos_counts, neg_counts):
-        table = np.array([[a, total_pos - a], [b, total_neg - b]], dtype=float)
-        if (table < 5).any():
-            _, p = fisher_exact(table)
-        else:
-            expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / table.sum()
-            mask = table > 0
-            g2 = 2.0 * np.sum(table[mask] * np.log(table[mask] / expected[mask]))
-            p = chi2.sf(g2, 1)
-        p_values.append(p)
-    p_values = np.array(p_values)
+    a = np.asarray(pos_counts, dtype=float)
+    b = np.asarray(neg_counts, dtype=float)
+    # One 2x2 table per row, flattened as [[a, c], [b, d]]
+    tables = np.column_stack([a, total_pos - a, b, total_neg - b])
+    row_sums = np.array([total_pos, total_pos, total_neg, total_neg], dtype=float)
+    col_sums = np.column_stack([a + b, tables[:, 1] + tables[:, 3]])
+    expected = row_sums * col_sums[:, [0, 1, 0, 1]] / tables.sum(axis=1, keepdims=True)
+
+    # G-test for every row at once; empty cells contribute nothing
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(tables > 0, tables * np.log(tables / expected), 0.0)
+    p_values = chi2.sf(2.0 * terms.sum(axis=1), 1)
+
+    # Any observed cell below 5: fall back to Fisher's exact test row by row
+    for i in np.flatnonzero((tables < 5).any(axis=1)):
+        _, p_values[i] = fisher_exact(tables[i].reshape(2, 2))
+
     n = len(p_values)
     order = np.argsort(p_values)
     ranked = p_values[order]
-    q = np.empty(n)
-    prev = 1.0
-    for i in range(n - 1, -1, -1):
-        rank = i + 1
-        val = ranked[i] * n / rank
-        prev = min(prev, val)
-        q[i] = prev
+    # Running minimum from the largest p-value down, capped at 1
+    q = np.minimum.accumulate((ranked * n / np.arange(1, n + 1))[::-1])[::-1]
+    q = np.minimum(q, 1.0)
     q_values = np.empty(n)
     q_values[order] = q
     return p_values, q_values
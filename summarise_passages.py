@@ -13,13 +13,47 @@ Usage:
 import argparse
 import json
 import os
-import time
 from datetime import datetime
+from functools import partial
+from itertools import islice
 
-from openai import OpenAI
 from tqdm import tqdm
 
-from pausanias_db import add_database_argument, connect
+from llm_cache import create_llm_cache_table, get_cached_completions, save_cached_completions
+from pausanias_db import add_database_argument, connect, count_rows, stream_rows
+from pausanias_openai import (
+    add_rate_limit_argument,
+    cached_prompt_tokens,
+    create_openai_client,
+    create_rate_limiter,
+    map_concurrently,
+    prompt_cache_options,
+    rate_limited,
+)
+
+COMMIT_EVERY = 50
+CACHE_LOOKUP_BATCH_SIZE = 200
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You summarise passages from Pausanias' Description of Greece. "
+    "Given an English translation of a passage, produce a single brief sentence (under 100 characters if possible) "
+    "summarising what the passage is about. Focus on the key subject: a place, person, monument, or event. "
+    "Do not start with 'This passage' or 'Pausanias'. Just state the subject directly. "
+    "Examples: 'The temple of Athena at Sounion', 'Theseus defeats the Minotaur', "
+    "'Dedications in the Athenian agora'."
+)
+SUMMARY_PROMPT_CACHE_KEY = "pausanias-summarise"
+UPSERT_SUMMARY_SQL = """
+    INSERT INTO passage_summaries
+    (passage_id, summary, model, timestamp, input_tokens, output_tokens)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (passage_id) DO UPDATE SET
+        summary = EXCLUDED.summary,
+        model = EXCLUDED.model,
+        timestamp = EXCLUDED.timestamp,
+        input_tokens = EXCLUDED.input_tokens,
+        output_tokens = EXCLUDED.output_tokens
+"""
 
 
 def parse_arguments():
@@ -34,7 +68,10 @@ def parse_arguments():
     parser.add_argument("--model", default="gpt-5.6-luna",
                         help="OpenAI model to use (default: gpt-5.6-luna)")
     parser.add_argument("--resummarise", action="store_true",
-                        help="Re-process already summarised passages")
+                        help="Re-process already summarised passages, bypassing the completion cache")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of concurrent API calls (default: 1)")
+    add_rate_limit_argument(parser)
     return parser.parse_args()
 
 
@@ -60,8 +97,7 @@ def create_table(conn):
     conn.commit()
 
 
-def get_unsummarised_passages(conn, limit=None, resummarise=False):
-    """Get passages that need summaries."""
+def unsummarised_passages_query(limit=None, resummarise=False):
     if resummarise:
         query = """
             SELECT p.id, t.english_translation
@@ -82,99 +118,170 @@ def get_unsummarised_passages(conn, limit=None, resummarise=False):
         """
 
     if limit:
-        query += f" LIMIT {limit}"
+        query += f" LIMIT {int(limit)}"
+    return query
+
 
-    cursor = conn.cursor()
-    cursor.execute(query)
-    return cursor.fetchall()
+def count_unsummarised_passages(conn, limit=None, resummarise=False):
+    """Count passages that need summaries."""
+    return count_rows(conn, unsummarised_passages_query(limit, resummarise))
+
+
+def get_unsummarised_passages(conn, limit=None, resummarise=False):
+    """Stream passages that need summaries."""
+    return stream_rows(conn, unsummarised_passages_query(limit, resummarise))
 
 
 def summarise_passage(client, model, passage_id, english_text):
-    """Generate a one-line summary of a passage."""
+    """Generate a one-line summary of a passage.
+
+    Returns (summary, input_tokens, output_tokens, cached_input_tokens,
+    error). This runs on worker threads, so failures come back as error text
+    for the main loop to report rather than being printed here.
+    """
     try:
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": "You summarise passages from Pausanias' Description of Greece. "
-                 "Given an English translation of a passage, produce a single brief sentence (under 100 characters if possible) "
-                 "summarising what the passage is about. Focus on the key subject: a place, person, monument, or event. "
-                 "Do not start with 'This passage' or 'Pausanias'. Just state the subject directly. "
-                 "Examples: 'The temple of Athena at Sounion', 'Theseus defeats the Minotaur', "
-                 "'Dedications in the Athenian agora'."},
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
                 {"role": "user", "content": english_text}
-            ]
+            ],
+            **prompt_cache_options(SUMMARY_PROMPT_CACHE_KEY),
         )
 
         summary = response.choices[0].message.content.strip()
         input_tokens = response.usage.prompt_tokens
         output_tokens = response.usage.completion_tokens
+        cached_tokens = cached_prompt_tokens(response.usage)
 
-        return summary, input_tokens, output_tokens
+        return summary, input_tokens, output_tokens, cached_tokens, None
 
     except Exception as e:
-        print(f"Error summarising passage {passage_id}: {e}")
-        return None, 0, 0
-
-
-def save_summary(conn, passage_id, summary, model, input_tokens, output_tokens):
-    """Save a summary to the database."""
-    conn.execute("""
-        INSERT INTO passage_summaries
-        (passage_id, summary, model, timestamp, input_tokens, output_tokens)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON CONFLICT (passage_id) DO UPDATE SET
-            summary = EXCLUDED.summary,
-            model = EXCLUDED.model,
-            timestamp = EXCLUDED.timestamp,
-            input_tokens = EXCLUDED.input_tokens,
-            output_tokens = EXCLUDED.output_tokens
-    """, (passage_id, summary, model, datetime.now().isoformat(),
-          input_tokens, output_tokens))
+        return None, 0, 0, 0, str(e)
+
+
+def save_summaries(conn, summaries):
+    """Save (passage_id, summary, model, input_tokens, output_tokens) rows in one
+    executemany; the caller commits."""
+    timestamp = datetime.now().isoformat()
+    conn.cursor().executemany(
+        UPSERT_SUMMARY_SQL,
+        [
+            (passage_id, summary, model, timestamp, input_tokens, output_tokens)
+            for passage_id, summary, model, input_tokens, output_tokens in summaries
+        ],
+    )
+
+
+def flush_summaries(conn, summaries, cache_entries):
+    """Write buffered summaries and cache entries together, then commit."""
+    save_cached_completions(conn, cache_entries)
+    save_summaries(conn, summaries)
     conn.commit()
+    cache_entries.clear()
+    summaries.clear()
 
 
 def main():
     args = parse_arguments()
 
     api_key = load_openai_api_key(args.openai_api_key_file)
-    client = OpenAI(api_key=api_key)
+    client = create_openai_client(api_key)
+
+    conn = connect(args.database_url, bulk_writes=True)
 
-    conn = connect(args.database_url)
+    # Rows buffered on this thread and written with one executemany per batch
+    pending_summaries = []
+    pending_cache_entries = []
 
     try:
         create_table(conn)
+        create_llm_cache_table(conn)
 
-        passages = get_unsummarised_passages(conn, args.stop_after, args.resummarise)
-        print(f"Found {len(passages)} passages to summarise")
+        passage_count = count_unsummarised_passages(conn, args.stop_after, args.resummarise)
+        print(f"Found {passage_count} passages to summarise")
 
-        if not passages:
+        if not passage_count:
             return
+        passages = get_unsummarised_passages(conn, args.stop_after, args.resummarise)
 
         total_input_tokens = 0
         total_output_tokens = 0
+        total_cached_tokens = 0
         summarised = 0
-
-        iterator = tqdm(passages) if args.progress_bar else passages
-
-        for passage_id, english_text in iterator:
-            summary, input_tokens, output_tokens = summarise_passage(
-                client, args.model, passage_id, english_text
-            )
-
+        cache_hits = 0
+        progress = tqdm(total=passage_count) if args.progress_bar else None
+        # Messages that must still appear under --progress-bar go through
+        # tqdm.write so they don't tear the bar
+        report = progress.write if progress is not None else print
+
+        def uncached_passages():
+            """Yield passages the model must summarise, serving cache hits inline.
+
+            Reads the stream in batches with one cache query each, so the
+            workers start on the first misses instead of waiting for the
+            whole table to be checked.
+            """
+            nonlocal summarised, cache_hits
+            while batch := list(islice(passages, CACHE_LOOKUP_BATCH_SIZE)):
+                # Re-summarising must ask the model again
+                cached = {} if args.resummarise else get_cached_completions(
+                    conn, args.model, SUMMARY_SYSTEM_PROMPT,
+                    [english_text for _, english_text in batch])
+                for passage_id, english_text in batch:
+                    if english_text not in cached:
+                        yield passage_id, english_text
+                        continue
+                    summary, input_tokens, output_tokens = cached[english_text]
+                    pending_summaries.append((passage_id, summary, args.model,
+                                              input_tokens, output_tokens))
+                    summarised += 1
+                    cache_hits += 1
+                    if progress is not None:
+                        progress.update()
+                    else:
+                        print(f"  {passage_id}: {summary} (cached)")
+
+        summarise = partial(summarise_passage, client, args.model)
+        summarise = rate_limited(summarise, create_rate_limiter(args.requests_per_minute))
+        results = map_concurrently(summarise, uncached_passages(), args.concurrency)
+        for count, ((passage_id, english_text), result) in enumerate(results, start=1):
+            summary, input_tokens, output_tokens, cached_tokens, error = result
             if summary:
-                save_summary(conn, passage_id, summary, args.model,
-                             input_tokens, output_tokens)
+                pending_cache_entries.append((args.model, SUMMARY_SYSTEM_PROMPT, english_text,
+                                              summary, input_tokens, output_tokens))
+                pending_summaries.append((passage_id, summary, args.model,
+                                          input_tokens, output_tokens))
                 summarised += 1
                 total_input_tokens += input_tokens
                 total_output_tokens += output_tokens
+                total_cached_tokens += cached_tokens
 
                 if not args.progress_bar:
                     print(f"  {passage_id}: {summary}")
-
+            elif error:
+                report(f"Error summarising passage {passage_id}: {error}")
+            else:
+                report(f"Error summarising passage {passage_id}: empty summary")
+
+            # Write in batches; a summary and its cache entry share a transaction
+            if count % COMMIT_EVERY == 0:
+                flush_summaries(conn, pending_summaries, pending_cache_entries)
+            if progress is not None:
+                progress.update()
+        flush_summaries(conn, pending_summaries, pending_cache_entries)
+
+        if progress is not None:
+            progress.close()
         print(f"\nSummarisation complete:")
-        print(f"  Summarised: {summarised}")
+        print(f"  Summarised: {summarised} ({cache_hits} from cache)")
         print(f"  Total tokens: {total_input_tokens} input, {total_output_tokens} output")
+        print(f"  Prompt cache: {total_cached_tokens} input tokens served from cache")
 
+    except Exception:
+        # Committing now would fail inside the aborted transaction and hide the error
+        conn.rollback()
+        raise
     finally:
         conn.close()
 
@@ -0,0 +1,95 @@
+from llm_cache import (
+    completion_cache_key,
+    get_cached_completion,
+    get_cached_completions,
+    save_cached_completion,
+    save_cached_completions,
+)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def executemany(self, sql, params_seq):
+        for params in params_seq:
+            self.conn.execute(sql, params)
+
+
+class FakeConn:
+    def __init__(self):
+        self.rows = {}
+        self.selects = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def execute(self, sql, params, prepare=None):
+        if sql.lstrip().startswith("INSERT"):
+            key, _model, text, input_tokens, output_tokens, _created_at = params
+            self.rows[key] = (text, input_tokens, output_tokens)
+            return FakeResult([])
+        self.selects += 1
+        if "ANY" in sql:
+            return FakeResult([(key, *self.rows[key]) for key in params[0] if key in self.rows])
+        return FakeResult([self.rows[params[0]]] if params[0] in self.rows else [])
+
+
+def test_completion_cache_key_separates_prompt_boundaries():
+    assert completion_cache_key("gpt-5", "ab", "c") != completion_cache_key("gpt-5", "a", "bc")
+    assert completion_cache_key("gpt-5", "a", "b") == completion_cache_key("gpt-5", "a", "b")
+
+
+def test_cached_completion_round_trip_is_scoped_to_model():
+    conn = FakeConn()
+
+    save_cached_completion(conn, "gpt-5", "Summarise.", "Theseus", "Theseus and the bull", 120, 8)
+
+    assert get_cached_completion(conn, "gpt-5", "Summarise.", "Theseus") == (
+        "Theseus and the bull",
+        120,
+        8,
+    )
+    assert get_cached_completion(conn, "gpt-5-mini", "Summarise.", "Theseus") is None
+
+
+def test_save_cached_completions_writes_every_entry():
+    conn = FakeConn()
+
+    save_cached_completions(conn, [
+        ("gpt-5", "Summarise.", "Theseus", "Theseus and the bull", 120, 8),
+        ("gpt-5", "Summarise.", "Pelops", "The chariot race of Pelops", 110, 9),
+    ])
+
+    assert get_cached_completion(conn, "gpt-5", "Summarise.", "Pelops") == (
+        "The chariot race of Pelops",
+        110,
+        9,
+    )
+    assert len(conn.rows) == 2
+
+
+def test_get_cached_completions_looks_up_a_batch_in_one_query():
+    conn = FakeConn()
+    save_cached_completions(conn, [
+        ("gpt-5", "Summarise.", "Theseus", "Theseus and the bull", 120, 8),
+        ("gpt-5-mini", "Summarise.", "Pelops", "The chariot race of Pelops", 110, 9),
+    ])
+
+    cached = get_cached_completions(conn, "gpt-5", "Summarise.", ["Theseus", "Pelops", "Minos"])
+
+    assert cached == {"Theseus": ("Theseus and the bull", 120, 8)}
+    assert conn.selects == 1
+    assert get_cached_completions(conn, "gpt-5", "Summarise.", []) == {}
+    assert conn.selects == 1
@@ -0,0 +1,21 @@
+from pausanias_importer import parse_pausanias_file
+
+
+def test_parse_pausanias_file_splits_sections_and_collapses_whitespace(tmp_path):
+    source = tmp_path / "pausanias.txt"
+    source.write_text(
+        "#1.1.1# τῆς ἠπείρου τῆς Ἑλληνικῆς\n   κατὰ νήσους\n#1.1.2# ὁ δὲ Πειραιεὺς\n",
+        encoding="utf-8",
+    )
+
+    assert list(parse_pausanias_file(source)) == [
+        ("1.1.1", "τῆς ἠπείρου τῆς Ἑλληνικῆς κατὰ νήσους"),
+        ("1.1.2", "ὁ δὲ Πειραιεὺς"),
+    ]
+
+
+def test_parse_pausanias_file_yields_nothing_for_an_empty_file(tmp_path):
+    source = tmp_path / "empty.txt"
+    source.write_bytes(b"")
+
+    assert list(parse_pausanias_file(source)) == []
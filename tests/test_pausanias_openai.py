@@ -0,0 +1,59 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from pausanias_openai import (
+    RateLimiter,
+    cached_prompt_tokens,
+    create_rate_limiter,
+    map_concurrently,
+    rate_limited,
+)
+
+
+def test_map_concurrently_returns_every_row_with_bounded_concurrency():
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def square(value):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return value * value
+
+    results = dict(map_concurrently(square, [(n,) for n in range(10)], concurrency=3))
+
+    assert results == {(n,): n * n for n in range(10)}
+    assert peak <= 3
+
+
+def test_cached_prompt_tokens_reads_usage_details():
+    usage = SimpleNamespace(prompt_tokens_details=SimpleNamespace(cached_tokens=1024))
+
+    assert cached_prompt_tokens(usage) == 1024
+    assert cached_prompt_tokens(SimpleNamespace(prompt_tokens_details=None)) == 0
+    assert cached_prompt_tokens(SimpleNamespace()) == 0
+
+
+def test_rate_limiter_spaces_calls_after_the_burst():
+    limiter = RateLimiter(requests_per_minute=1200)  # 20 per second, burst of 20
+    calls = []
+    limited = rate_limited(calls.append, limiter)
+
+    start = time.monotonic()
+    for n in range(25):
+        limited(n)
+    elapsed = time.monotonic() - start
+
+    assert calls == list(range(25))
+    assert elapsed >= 0.2
+
+
+def test_create_rate_limiter_is_optional():
+    assert create_rate_limiter(None) is None
+    assert rate_limited(len, None) is len
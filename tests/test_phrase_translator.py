@@ -0,0 +1,146 @@
+import pytest
+
+import phrase_translator
+from phrase_translator import clear_translation_cache, get_translations_for_phrases
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConn:
+    def __init__(self, cached):
+        self.cached = cached
+        self.queries = []
+
+    def execute(self, sql, params, prepare=None):
+        self.queries.append((sql, params))
+        (phrases,) = params
+        return FakeResult([
+            (phrase, *self.cached[phrase]) for phrase in phrases if phrase in self.cached
+        ])
+
+
+def test_get_translations_for_phrases_reads_cache_in_batches(monkeypatch):
+    monkeypatch.setattr(phrase_translator, "LOOKUP_BATCH_SIZE", 2)
+    clear_translation_cache()
+    conn = FakeConn({"Ἀθηναῖοι": ("Athenians", True), "λόγος": ("word", False)})
+
+    translations = get_translations_for_phrases(
+        conn, None, "gpt-5", ["Ἀθηναῖοι", "λόγος", "ἄγνωστον"]
+    )
+
+    assert translations == {
+        "Ἀθηναῖοι": ("Athenians", True),
+        "λόγος": ("word", False),
+        "ἄγνωστον": ("", False),
+    }
+    assert len(conn.queries) == 2
+
+
+def test_get_translations_for_phrases_reuses_translations_within_a_run():
+    clear_translation_cache()
+    conn = FakeConn({"λόγος": ("word", False)})
+
+    get_translations_for_phrases(conn, None, "gpt-5", ["λόγος"])
+    translations = get_translations_for_phrases(conn, None, "gpt-5", ["λόγος"])
+
+    assert translations == {"λόγος": ("word", False)}
+    assert len(conn.queries) == 1
+
+
+def test_get_translations_for_phrases_fetches_each_new_phrase_once(monkeypatch):
+    clear_translation_cache()
+    conn = FakeConn({})
+    conn.commit = lambda: None
+    fetched = []
+
+    def fake_translate_phrase(client, model, phrase):
+        fetched.append(phrase)
+        return "Pausanias", True, 10, 2, None
+
+    monkeypatch.setattr(phrase_translator, "translate_phrase", fake_translate_phrase)
+    monkeypatch.setattr(phrase_translator, "save_phrase_translation", lambda *args: None)
+
+    translations = get_translations_for_phrases(
+        conn, object(), "gpt-5", ["Παυσανίας", "Παυσανίας"]
+    )
+
+    assert fetched == ["Παυσανίας"]
+    assert translations == {"Παυσανίας": ("Pausanias", True)}
+
+
+
+def test_get_translations_for_phrases_forgets_rolled_back_fetches(monkeypatch):
+    clear_translation_cache()
+    conn = FakeConn({})
+    rollbacks = []
+
+    def failing_commit():
+        raise RuntimeError("commit failed")
+
+    conn.commit = failing_commit
+    conn.rollback = lambda: rollbacks.append(True)
+    monkeypatch.setattr(
+        phrase_translator, "translate_phrase", lambda client, model, phrase: ("Pausanias", True, 10, 2, None)
+    )
+    monkeypatch.setattr(phrase_translator, "save_phrase_translation", lambda *args: None)
+
+    with pytest.raises(RuntimeError):
+        get_translations_for_phrases(conn, object(), "gpt-5", ["Παυσανίας"])
+
+    assert rollbacks == [True]
+    assert get_translations_for_phrases(conn, None, "gpt-5", ["Παυσανίας"]) == {
+        "Παυσανίας": ("", False)
+    }
+
+
+def test_translation_cache_is_bounded_and_keyed_on_phrase(monkeypatch):
+    monkeypatch.setattr(phrase_translator, "TRANSLATION_CACHE_SIZE", 2)
+    clear_translation_cache()
+    conn = FakeConn({"α": ("a", False), "β": ("b", False), "γ": ("c", False)})
+
+    get_translations_for_phrases(conn, None, "gpt-5", ["α", "β", "γ"])
+    assert list(phrase_translator._TRANSLATION_CACHE) == ["β", "γ"]
+
+    # Like the phrase_translations table, the cache serves a row whatever model wrote it
+    conn.queries.clear()
+    assert get_translations_for_phrases(conn, None, "gpt-5-mini", ["β"]) == {"β": ("b", False)}
+    assert conn.queries == []
+
+def _chunk(content=None, usage=None):
+    delta = type("Delta", (), {"content": content})()
+    choices = [type("Choice", (), {"delta": delta})()] if content is not None else []
+    return type("Chunk", (), {"choices": choices, "usage": usage})()
+
+
+class FakeStreamingCompletions:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.request = None
+
+    def create(self, **kwargs):
+        self.request = kwargs
+        return iter(self.chunks)
+
+
+def test_translate_phrase_accumulates_streamed_content_and_usage():
+    usage = type("Usage", (), {"prompt_tokens": 40, "completion_tokens": 9})()
+    completions = FakeStreamingCompletions([
+        _chunk('{"translation": "Athen'),
+        _chunk('ians", "is_proper_noun": true}'),
+        _chunk(usage=usage),
+    ])
+    client = type("Client", (), {"chat": type("Chat", (), {"completions": completions})()})()
+
+    result = phrase_translator.translate_phrase(client, "gpt-5", "Ἀθηναῖοι")
+
+    assert result == ("Athenians", True, 40, 9, None)
+    assert completions.request["stream"] is True
+    assert completions.request["stream_options"] == {"include_usage": True}
+    assert completions.request["response_format"]["type"] == "json_schema"
+    assert completions.request["max_completion_tokens"] == phrase_translator.MAX_COMPLETION_TOKENS
@@ -0,0 +1,41 @@
+import pytest
+
+import find_predictors
+import find_sentence_predictors
+
+
+class RecordingConn:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split()))
+
+    def commit(self):
+        pass
+
+
+@pytest.mark.parametrize(
+    "module, tables",
+    [
+        (find_predictors, ["mythicness_predictors", "skepticism_predictors"]),
+        (
+            find_sentence_predictors,
+            ["sentence_mythicness_predictors", "sentence_skepticism_predictors"],
+        ),
+    ],
+)
+def test_create_predictor_tables_indexes_coefficient_after_recreating(module, tables):
+    conn = RecordingConn()
+
+    module.create_predictor_tables(conn)
+
+    for table in tables:
+        create = conn.statements.index(
+            next(sql for sql in conn.statements if sql.startswith(f"CREATE TABLE {table} ("))
+        )
+        index = conn.statements.index(
+            f"CREATE INDEX idx_{table}_coefficient ON {table} (coefficient DESC)"
+        )
+        assert index > create
+        assert f"DROP TABLE IF EXISTS {table}" not in conn.statements[index:]
@@ -0,0 +1,100 @@
+import json
+from types import SimpleNamespace
+
+from sentence_mythic_sceptic_analyser import (
+    LEGACY_LABEL_SOURCE_PREFILTER,
+    analyse_sentences_legacy,
+    prefilter_legacy_sentences,
+    save_legacy_analysis_batch,
+    train_legacy_prefilter,
+)
+
+
+class FakeCompletions:
+    def __init__(self, annotations):
+        self.annotations = annotations
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        tool_call = SimpleNamespace(
+            function=SimpleNamespace(arguments=json.dumps({"annotations": self.annotations}))
+        )
+        return SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=300, completion_tokens=40),
+            choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[tool_call]))],
+        )
+
+
+def test_analyse_sentences_legacy_labels_a_batch_in_one_call():
+    completions = FakeCompletions([
+        {"item": 2, "references_mythic_era": False, "expresses_scepticism": True},
+        {"item": 1, "references_mythic_era": True, "expresses_scepticism": False},
+    ])
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    rows = [
+        ("1.1.1", 1, "Ἀθηναῖοι", "The Athenians"),
+        ("1.1.1", 2, "λέγουσι", "They say"),
+        ("1.1.2", 1, "ἔστι", "There is"),
+    ]
+
+    results = analyse_sentences_legacy(client, "gpt-5", rows)
+
+    assert len(completions.calls) == 1
+    assert [row for row, _ in results] == rows
+    first, second, third = (result for _, result in results)
+    assert (first["references_mythic_era"], first["expresses_scepticism"]) == (True, False)
+    assert (second["references_mythic_era"], second["expresses_scepticism"]) == (False, True)
+    assert third["references_mythic_era"] is None and third["error"]
+    assert sum(result["input_tokens"] for _, result in results) == 300
+
+
+def test_legacy_prefilter_keeps_uncertain_sentences_for_the_api():
+    training_rows = [
+        ("μῦθος ἥρως", "a myth of the hero", True, False),
+        ("μῦθος θεός", "a myth of the god", True, True),
+        ("στρατηγός πόλεμος", "the general and the war", False, False),
+        ("στρατηγός νίκη", "the general won", False, True),
+    ] * 10
+    heads = train_legacy_prefilter(training_rows)
+    rows = [
+        ("1.1.1", 1, "μῦθος ἥρως", "a myth of the hero"),
+        ("1.1.1", 2, "στρατηγός πόλεμος", "the general and the war"),
+    ]
+
+    labelled, remaining = prefilter_legacy_sentences(heads, rows, confidence=0.5)
+    assert [(passage, number, mythic) for passage, number, mythic, _ in labelled] == [
+        ("1.1.1", 1, True),
+        ("1.1.1", 2, False),
+    ]
+    assert remaining == []
+
+    labelled, remaining = prefilter_legacy_sentences(heads, rows, confidence=1.0)
+    assert labelled == []
+    assert remaining == rows
+
+
+def test_legacy_prefilter_needs_both_classes():
+    assert train_legacy_prefilter([("μῦθος", "myth", True, False)] * 5) is None
+
+
+class FakeCursor:
+    def __init__(self):
+        self.executemany_calls = []
+
+    def executemany(self, sql, params):
+        self.executemany_calls.append((sql, params))
+
+
+def test_save_legacy_analysis_batch_records_the_label_source():
+    cursor = FakeCursor()
+    conn = SimpleNamespace(cursor=lambda: cursor)
+
+    save_legacy_analysis_batch(conn, [("1.1.1", 1, True, False)])
+    save_legacy_analysis_batch(
+        conn, [("1.1.1", 2, False, True)], source=LEGACY_LABEL_SOURCE_PREFILTER
+    )
+
+    (_, llm_params), (_, prefilter_params) = cursor.executemany_calls
+    assert llm_params == [(True, False, "llm", "1.1.1", 1)]
+    assert prefilter_params == [(False, True, "prefilter", "1.1.1", 2)]
@@ -0,0 +1,50 @@
+import numpy as np
+from scipy.stats import chi2, fisher_exact
+
+from stats_utils import compute_p_q_values
+
+
+def scalar_p_value(a, b, total_pos, total_neg):
+    table = np.array([[a, total_pos - a], [b, total_neg - b]], dtype=float)
+    if (table < 5).any():
+        return fisher_exact(table)[1]
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / table.sum()
+    mask = table > 0
+    return chi2.sf(2.0 * np.sum(table[mask] * np.log(table[mask] / expected[mask])), 1)
+
+
+def test_compute_p_q_values_matches_per_table_tests():
+    rng = np.random.default_rng(7)
+    pos_counts = rng.integers(0, 40, 200)
+    neg_counts = rng.integers(0, 40, 200)
+
+    p_values, q_values = compute_p_q_values(pos_counts, neg_counts, 900, 1200)
+
+    expected = [scalar_p_value(a, b, 900, 1200) for a, b in zip(pos_counts, neg_counts)]
+    np.testing.assert_allclose(p_values, expected, rtol=1e-12)
+    assert np.all(q_values >= p_values)
+    assert np.all(q_values <= 1.0)
+
+
+def test_compute_p_q_values_applies_benjamini_hochberg():
+    rng = np.random.default_rng(11)
+    pos_counts = rng.integers(0, 60, 300)
+    neg_counts = rng.integers(0, 60, 300)
+
+    p_values, q_values = compute_p_q_values(pos_counts, neg_counts, 1500, 1500)
+
+    n = len(p_values)
+    order = np.argsort(p_values)
+    expected = np.empty(n)
+    running = 1.0
+    for i in range(n - 1, -1, -1):
+        running = min(running, p_values[order[i]] * n / (i + 1))
+        expected[order[i]] = running
+    np.testing.assert_allclose(q_values, expected, rtol=1e-12)
+
+
+def test_compute_p_q_values_handles_no_predictors():
+    p_values, q_values = compute_p_q_values([], [], 10, 10)
+
+    assert p_values.shape == (0,)
+    assert q_values.shape == (0,)
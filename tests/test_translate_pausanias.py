@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+from translate_pausanias import TRANSLATION_PROMPT_CACHE_KEY, translate_passage
+
+
+def chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class FakeStreamingCompletions:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.request = None
+
+    def create(self, **kwargs):
+        self.request = kwargs
+        return iter(self.chunks)
+
+
+def test_translate_passage_assembles_streamed_translation():
+    usage = SimpleNamespace(
+        prompt_tokens=180,
+        completion_tokens=30,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=128),
+    )
+    completions = FakeStreamingCompletions([
+        chunk("Beyond the harbour "),
+        chunk("is a temple of Athena. "),
+        chunk(usage=usage),
+    ])
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    result = translate_passage(client, "gpt-5", "1.1.1", "ὑπὲρ τὸν λιμένα ναὸς Ἀθηνᾶς")
+
+    assert result == ("Beyond the harbour is a temple of Athena.", 180, 30, 128, None)
+    assert completions.request["stream"] is True
+    assert completions.request["stream_options"] == {"include_usage": True}
+    assert completions.request["extra_body"] == {"prompt_cache_key": TRANSLATION_PROMPT_CACHE_KEY}
+
+
+def test_translate_passage_returns_errors_instead_of_printing(capsys):
+    class FailingCompletions:
+        def create(self, **kwargs):
+            raise RuntimeError("rate limited")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=FailingCompletions()))
+
+    result = translate_passage(client, "gpt-5", "1.1.1", "ὑπὲρ τὸν λιμένα")
+
+    assert result == ("", 0, 0, 0, "rate limited")
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from website.data import split_passages_by_chapter
+from website.generators import _page_writer
+
+
+def test_split_passages_by_chapter_orders_chapters_numerically():
+    passages = pd.DataFrame(
+        {
+            "id": ["1.10.1", "1.2.1", "1.2.2", "2.1.1"],
+            "passage": ["α", "β", "γ", "δ"],
+            "english_translation": ["a", None, "c", float("nan")],
+        }
+    )
+
+    chapter_passages = split_passages_by_chapter(passages)
+
+    assert [chapter for chapter, _ in chapter_passages] == ["1.2", "1.10", "2.1"]
+    chapter_df = dict(chapter_passages)["1.2"]
+    assert list(chapter_df["id"]) == ["1.2.1", "1.2.2"]
+    assert list(chapter_df["english_translation"]) == ["", "c"]
+    assert "chapter" not in passages
+
+
+def test_page_writer_writes_pages_and_surfaces_write_errors(tmp_path):
+    with _page_writer() as write_page:
+        write_page(tmp_path / "1_1.html", "<p>1.1</p>")
+
+    assert (tmp_path / "1_1.html").read_text(encoding="utf-8") == "<p>1.1</p>"
+    with pytest.raises(FileNotFoundError):
+        with _page_writer() as write_page:
+            write_page(tmp_path / "missing" / "1_2.html", "<p>1.2</p>")
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from website.data import _cached_per_connection, table_exists
+
+
+class FakeConnection:
+    pass
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.queries += 1
+
+    def fetchall(self):
+        return [("passages",), ("translations",)]
+
+
+class FakeCatalogConnection:
+    def __init__(self):
+        self.queries = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def test_cached_per_connection_reuses_result_for_same_connection():
+    calls = []
+
+    @_cached_per_connection
+    def load(conn, version=None):
+        calls.append((conn, version))
+        return pd.DataFrame({"word": ["καί", "δέ"]})
+
+    conn = FakeConnection()
+    first = load(conn)
+    second = load(conn)
+
+    assert len(calls) == 1
+    # Hits share the cached frame rather than paying for a copy
+    assert second is first
+
+    load(conn, version="other")
+    load(FakeConnection())
+    assert len(calls) == 3
+
+
+def test_table_exists_reads_catalogue_once_per_connection():
+    conn = FakeCatalogConnection()
+
+    assert table_exists(conn, "passages")
+    assert table_exists(conn, "translations")
+    assert not table_exists(conn, "wikidata_links")
+    assert conn.queries == 1
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+
+from website.data import (
+    get_passage_mythicness_metrics,
+    get_sentence_simplified_skepticism_metrics,
+    get_simplified_mythicness_metrics,
+)
+
+
+class FakeColumn:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeCursor:
+    def __init__(self, rows, columns=()):
+        self.rows = rows
+        self.description = [FakeColumn(name) for name in columns]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+        self.pipelines = 0
+
+    def cursor(self):
+        return FakeCursor([(table,) for table in self.tables])
+
+    @contextmanager
+    def pipeline(self):
+        self.pipelines += 1
+        yield
+
+    def execute(self, query):
+        self.queries.append(query)
+        table = query.split("FROM ")[1].split()[0]
+        return FakeCursor(self.tables[table], ("id", "accuracy", "f1"))
+
+
+def test_metrics_getters_share_one_pipelined_load():
+    conn = FakeConnection({
+        "passage_mythicness_metrics": [(3, 0.8, None)],
+        "simplified_mythicness_metrics": [],
+    })
+
+    metrics = get_passage_mythicness_metrics(conn)
+    assert metrics["id"] == 3
+    assert metrics["accuracy"] == 0.8
+    assert metrics["f1"] is None
+    assert get_simplified_mythicness_metrics(conn) is None
+    assert get_sentence_simplified_skepticism_metrics(conn) is None
+
+    assert conn.pipelines == 1
+    assert len(conn.queries) == 2
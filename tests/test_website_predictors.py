@@ -0,0 +1,19 @@
+import pandas as pd
+
+from website.data import split_predictors
+
+
+def test_split_predictors_orders_each_side_strongest_first_and_drops_null_flags():
+    # Loader order: coefficient descending
+    predictors = pd.DataFrame(
+        {
+            "phrase": ["θεοί", "λέγουσι", "ἄγνωστον", "πόλει", "στρατός"],
+            "coefficient": [1.5, 0.25, 0.0, -0.5, -2.0],
+            "is_mythic": [1, 1, None, 0, 0],
+        }
+    )
+
+    mythic, historical = split_predictors(predictors, "is_mythic")
+
+    assert list(mythic["phrase"]) == ["θεοί", "λέγουσι"]
+    assert list(historical["phrase"]) == ["στρατός", "πόλει"]
@@ -3,13 +3,40 @@
 import argparse
 import os
 import sys
-import time
 from datetime import datetime
+from functools import partial
 
-from openai import OpenAI
 from tqdm import tqdm
 
-from pausanias_db import add_database_argument, connect
+from pausanias_db import add_database_argument, connect, count_rows, stream_rows
+from pausanias_openai import (
+    add_rate_limit_argument,
+    cached_prompt_tokens,
+    create_openai_client,
+    create_rate_limiter,
+    map_concurrently,
+    prompt_cache_options,
+    rate_limited,
+)
+
+COMMIT_EVERY = 50
+
+TRANSLATION_SYSTEM_PROMPT = """You are an expert in Ancient Greek who specializes in translating Pausanias. 
+Translate the provided Greek passage into clear, accurate English that preserves the meaning and style of the original.
+Provide only the translation itself, with no additional notes or commentary.
+Your translation should be scholarly but readable, suitable for academic study of Pausanias."""
+TRANSLATION_PROMPT_CACHE_KEY = "pausanias-translate"
+UPSERT_TRANSLATION_SQL = """
+    INSERT INTO translations (passage_id, greek_text, english_translation, timestamp, model, input_tokens, output_tokens)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (passage_id) DO UPDATE SET
+        greek_text = EXCLUDED.greek_text,
+        english_translation = EXCLUDED.english_translation,
+        timestamp = EXCLUDED.timestamp,
+        model = EXCLUDED.model,
+        input_tokens = EXCLUDED.input_tokens,
+        output_tokens = EXCLUDED.output_tokens
+"""
 
 
 def parse_arguments():
@@ -25,6 +52,9 @@ def parse_arguments():
                         help="OpenAI model to use (default: gpt-5)")
     parser.add_argument("--debug", action="store_true", default=False,
                         help="Print the full API response for debugging")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Number of concurrent API calls (default: 1)")
+    add_rate_limit_argument(parser)
     
     return parser.parse_args()
 
@@ -54,9 +84,7 @@ def create_translation_tables(conn):
     
     conn.commit()
 
-def get_untranslated_passages(conn, limit=None):
-    """Get passages that haven't been translated yet."""
-    cursor = conn.cursor()
+def untranslated_passages_query(limit=None):
     query = """
     SELECT p.id, p.passage 
     FROM passages p
@@ -66,66 +94,84 @@ def get_untranslated_passages(conn, limit=None):
     """
     
     if limit:
-        query += f" LIMIT {limit}"
-    
-    cursor.execute(query)
-    return cursor.fetchall()
+        query += f" LIMIT {int(limit)}"
+    return query
+
+def count_untranslated_passages(conn, limit=None):
+    """Count passages that haven't been translated yet."""
+    return count_rows(conn, untranslated_passages_query(limit))
 
-def save_translation(conn, passage_id, greek_text, english_translation, model, input_tokens, output_tokens):
-    """Save translation to the database."""
+def get_untranslated_passages(conn, limit=None):
+    """Stream passages that haven't been translated yet."""
+    return stream_rows(conn, untranslated_passages_query(limit))
+
+def save_translations(conn, translations):
+    """Save (passage_id, greek_text, english_translation, model, input_tokens, output_tokens)
+    rows in one executemany; the caller commits."""
     timestamp = datetime.now().isoformat()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO translations (passage_id, greek_text, english_translation, timestamp, model, input_tokens, output_tokens)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (passage_id) DO UPDATE SET
-            greek_text = EXCLUDED.greek_text,
-            english_translation = EXCLUDED.english_translation,
-            timestamp = EXCLUDED.timestamp,
-            model = EXCLUDED.model,
-            input_tokens = EXCLUDED.input_tokens,
-            output_tokens = EXCLUDED.output_tokens
-        """,
-        (passage_id, greek_text, english_translation, timestamp, model, input_tokens, output_tokens)
+    conn.cursor().executemany(
+        UPSERT_TRANSLATION_SQL,
+        [
+            (passage_id, greek_text, english_translation, timestamp, model, input_tokens, output_tokens)
+            for passage_id, greek_text, english_translation, model, input_tokens, output_tokens
+            in translations
+        ],
     )
+
+def flush_translations(conn, translations):
+    """Write buffered translations, then commit."""
+    save_translations(conn, translations)
     conn.commit()
+    translations.clear()
+
+def translation_user_content(passage_id, passage_text):
+    """Build the user message for translating one passage."""
+    return f"Passage {passage_id}:\n\n{passage_text}\n\nPlease translate this passage from Pausanias into English."
 
 def translate_passage(client, model, passage_id, passage_text, debug=False):
-    """Translate a passage from Greek to English using OpenAI API and track token usage."""
-    
-    system_prompt = """You are an expert in Ancient Greek who specializes in translating Pausanias. 
-Translate the provided Greek passage into clear, accurate English that preserves the meaning and style of the original.
-Provide only the translation itself, with no additional notes or commentary.
-Your translation should be scholarly but readable, suitable for academic study of Pausanias."""
+    """Translate a passage from Greek to English using OpenAI API and track token usage.
+
+    Returns (translation, input_tokens, output_tokens, cached_input_tokens,
+    error). This runs on worker threads, so failures come back as error text
+    for the main loop to report rather than being printed here.
+    """
     
     try:
-        response = client.chat.completions.create(
+        stream = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Passage {passage_id}:\n\n{passage_text}\n\nPlease translate this passage from Pausanias into English."}
-            ]
+                {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
+                {"role": "user", "content": translation_user_content(passage_id, passage_text)}
+            ],
+            stream=True,
+            stream_options={"include_usage": True},
+            **prompt_cache_options(TRANSLATION_PROMPT_CACHE_KEY),
         )
         
-        # Extract token usage
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
+        # Collect the translation as it arrives; usage comes on the final,
+        # choice-less chunk
+        parts = []
+        input_tokens = output_tokens = cached_tokens = 0
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            if chunk.usage:
+                input_tokens = chunk.usage.prompt_tokens
+                output_tokens = chunk.usage.completion_tokens
+                cached_tokens = cached_prompt_tokens(chunk.usage)
+        translation = "".join(parts)
         
         # Debug output
         if debug:
             print("\n=== DEBUG: FULL API RESPONSE ===")
-            print(f"Response object: {response}")
+            print(f"Streamed content: {translation}")
+            print(f"Usage: {input_tokens} input ({cached_tokens} cached), {output_tokens} output")
             print("=== END DEBUG ===\n")
         
-        # Get the translation directly from the content
-        translation = response.choices[0].message.content
-        
-        return translation.strip(), input_tokens, output_tokens
+        return translation.strip(), input_tokens, output_tokens, cached_tokens, None
         
     except Exception as e:
-        print(f"Error translating passage {passage_id}: {str(e)}")
-        return "", 0, 0
+        return "", 0, 0, 0, str(e)
 
 if __name__ == '__main__':
     args = parse_arguments()
@@ -134,55 +180,78 @@ if __name__ == '__main__':
     api_key = load_openai_api_key(args.openai_api_key_file)
     
     # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    client = create_openai_client(api_key)
     
     # Connect to the database
-    conn = connect(args.database_url)
+    conn = connect(args.database_url, bulk_writes=True)
+    
+    # Rows buffered on this thread and written with one executemany per batch
+    pending_translations = []
     
     try:
         # Create the translation table if it doesn't exist
         create_translation_tables(conn)
         
-        # Get untranslated passages
-        passages = get_untranslated_passages(conn, args.stop_after)
+        # Count untranslated passages, then stream them
+        passage_count = count_untranslated_passages(conn, args.stop_after)
         
-        if not passages:
+        if not passage_count:
             print("No untranslated passages found in the database.")
             sys.exit(0)
         
-        print(f"Found {len(passages)} untranslated passages.")
+        print(f"Found {passage_count} untranslated passages.")
+        passages = get_untranslated_passages(conn, args.stop_after)
         
         # Process passages
-        iterator = tqdm(passages) if args.progress_bar else passages
+        progress = tqdm(total=passage_count) if args.progress_bar else None
+        # Messages that must still appear under --progress-bar go through
+        # tqdm.write so they don't tear the bar
+        report = progress.write if progress is not None else print
         total_input_tokens = 0
         total_output_tokens = 0
+        total_cached_tokens = 0
         
-        for passage_id, passage_text in iterator:
-            translation, input_tokens, output_tokens = translate_passage(
-                client, args.model, passage_id, passage_text, args.debug
-            )
+        translate = partial(translate_passage, client, args.model, debug=args.debug)
+        translate = rate_limited(translate, create_rate_limiter(args.requests_per_minute))
+        results = map_concurrently(translate, passages, args.concurrency)
+        for count, ((passage_id, passage_text), result) in enumerate(results, start=1):
+            translation, input_tokens, output_tokens, cached_tokens, error = result
             
             # Track tokens
             total_input_tokens += input_tokens
             total_output_tokens += output_tokens
+            total_cached_tokens += cached_tokens
             
             # Save translation to the database
             if translation:
-                save_translation(conn, passage_id, passage_text, translation, args.model, input_tokens, output_tokens)
+                pending_translations.append(
+                    (passage_id, passage_text, translation, args.model, input_tokens, output_tokens)
+                )
                 
                 if not args.progress_bar:
                     print(f"Processed passage {passage_id}, tokens={input_tokens}/{output_tokens}")
                     print(f"  Original: {passage_text[:100]}...")
                     print(f"  Translation: {translation[:100]}...")
+            elif error:
+                report(f"Failed to translate passage {passage_id}: {error}")
             else:
-                print(f"Failed to translate passage {passage_id}")
+                report(f"Failed to translate passage {passage_id}")
             
-            # Add a small delay to avoid rate limits
-            time.sleep(0.5)
+            # Write in batches rather than once per passage
+            if count % COMMIT_EVERY == 0:
+                flush_translations(conn, pending_translations)
+            if progress is not None:
+                progress.update()
         
-        print(f"Translation complete. Total tokens used: {total_input_tokens} input, {total_output_tokens} output")
+        flush_translations(conn, pending_translations)
+        if progress is not None:
+            progress.close()
+        print(f"Translation complete. Total tokens used: {total_input_tokens} input "
+              f"({total_cached_tokens} served from the prompt cache), {total_output_tokens} output")
     
     except Exception as e:
+        # Committing now would fail inside the aborted transaction and hide e
+        conn.rollback()
         print(f"Error: {str(e)}")
         sys.exit(1)
     
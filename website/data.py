@@ -1,11 +1,13 @@
 """Database operations and data retrieval functions."""
 
 import ast
+import functools
 import math
 import re
 import unicodedata
+import weakref
 from collections import Counter, defaultdict
-from itertools import combinations
+from itertools import combinations, groupby
 import pandas as pd
 from typing import Optional
 import networkx as nx
@@ -37,7 +39,8 @@ from lemma_text import (
     tokenize_greek,
 )
 from manto_place_feature_catalog import FEATURE_CATALOG
-from pausanias_db import read_sql_query, table_exists as pg_table_exists
+from pausanias_db import read_sql_query
+from phrase_translator import get_translations_for_phrases
 from stats_utils import compute_p_q_values
 
 WORD_PATTERN = re.compile(r"(?u)\b\w+\b")
@@ -208,32 +211,93 @@ NETWORK_BETWEENNESS_EXACT_LIMIT = 250
 NETWORK_BETWEENNESS_SAMPLE_SIZE = 120
 
 
+# The site build only reads the database, so loaders shared by several pages
+# can keep their result for the lifetime of the connection.
+_CONNECTION_CACHE = weakref.WeakKeyDictionary()
+
+
+def _cached_per_connection(loader):
+    """Memoise ``loader(conn, ...)`` per connection.
+
+    Every call returns the same cached object, so callers must treat it as
+    read-only and copy before modifying it.
+    """
+    @functools.wraps(loader)
+    def cached(conn, *args, **kwargs):
+        results = _CONNECTION_CACHE.setdefault(conn, {})
+        key = (loader.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in results:
+            results[key] = loader(conn, *args, **kwargs)
+        return results[key]
+    return cached
+
+
+_word_lemma_lookup = _cached_per_connection(load_word_lemma_lookup)
+
+
+@_cached_per_connection
+def _public_relations(conn):
+    """Return the names of every relation in the public schema."""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public'
+            """
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
 def table_exists(conn, table_name):
     """Return True if a table exists in the PostgreSQL database."""
-    return pg_table_exists(conn, table_name)
+    return table_name in _public_relations(conn)
 
+
+@functools.lru_cache(maxsize=None)
 def passage_id_sort_key(passage_id):
-    """Create a sort key for passage IDs in the format X.Y.Z."""
+    """Create a sort key for passage IDs in the format X.Y.Z.
+
+    Cached because sentence-level frames repeat each of the few thousand
+    passage IDs many times.
+    """
     parts = passage_id.split('.')
     # Convert each part to integer for proper numerical sorting
     return tuple(int(part) for part in parts)
 
+def split_passages_by_chapter(passages_df):
+    """Split analysed passages into (chapter, passages) pairs in reading order.
+
+    Missing translations become '' so the chapter-page loops can test
+    truthiness. Done once for both the mythic and skepticism pages.
+    """
+    passages_df = passages_df.assign(
+        chapter=passages_df['id'].str.extract(r'^(\d+\.\d+)', expand=False)
+    )
+    if 'english_translation' in passages_df:
+        passages_df['english_translation'] = passages_df['english_translation'].fillna('')
+    return sorted(
+        passages_df.groupby('chapter', sort=False),
+        key=lambda item: passage_id_sort_key(item[0]),
+    )
+
 def get_proper_nouns_by_passage(conn):
     """Get proper nouns (in nominative form) grouped by passage."""
     query = """
     SELECT passage_id, reference_form
     FROM proper_nouns
-    ORDER BY passage_id, reference_form
+    ORDER BY passage_id, reference_form COLLATE "C"
     """
     
-    df = read_sql_query(query, conn)
-    
-    # Group by passage_id
-    proper_nouns_dict = {}
-    for passage_id, group in df.groupby('passage_id'):
-        proper_nouns_dict[passage_id] = group['reference_form'].tolist()
-    
-    return proper_nouns_dict
+    with conn.cursor() as cursor:
+        cursor.execute(query)
+        # Group by passage_id; rows already arrive in passage order, and the
+        # "C" collation sorts each passage's nouns by code point like sorted()
+        return {
+            passage_id: [reference_form for _, reference_form in rows]
+            for passage_id, rows in groupby(cursor.fetchall(), key=lambda row: row[0])
+        }
 
 def get_translations(conn):
     """Get all available translations."""
@@ -242,10 +306,10 @@ def get_translations(conn):
     FROM translations
     """
     
-    df = read_sql_query(query, conn)
-    # Convert to dictionary for easy lookup
-    translations_dict = dict(zip(df['passage_id'], df['english_translation']))
-    return translations_dict
+    with conn.cursor() as cursor:
+        cursor.execute(query)
+        # Convert to dictionary for easy lookup
+        return dict(cursor.fetchall())
 
 def get_analyzed_passages(conn, limit=None):
     """Get passages that have been analyzed for both mythicness and skepticism."""
@@ -256,19 +320,12 @@ def get_analyzed_passages(conn, limit=None):
     LEFT JOIN translations t ON p.id = t.passage_id
     WHERE p.references_mythic_era IS NOT NULL
     AND p.expresses_scepticism IS NOT NULL
-    ORDER BY p.id
+    ORDER BY string_to_array(p.id, '.')::int[]
     """
-    
-    df = read_sql_query(query, conn)
-    df['sort_key'] = df['id'].apply(passage_id_sort_key)
-    df = df.sort_values('sort_key')
-    
-    # Remove the sort_key column as it's no longer needed
-    df = df.drop('sort_key', axis=1)
     if limit:
-        df = df.head(limit)
+        query += f" LIMIT {int(limit)}"
 
-    return df
+    return read_sql_query(query, conn)
 
 def get_mythicness_predictors(conn):
     """Get words/phrases that predict mythicness/historicity."""
@@ -321,6 +378,18 @@ def get_sentence_skepticism_predictors(conn):
     return df
 
 
+def split_predictors(predictors, flag_column):
+    """Split predictors into (positive, negative) frames, strongest first.
+
+    The predictor loaders already order rows by coefficient descending, so
+    the positive rows keep that order and the negative rows are reversed
+    rather than sorted again in pandas.
+    """
+    flags = predictors[flag_column]
+    # Rows with a NULL flag belong to neither side
+    return predictors[flags == 1], predictors[flags == 0][::-1]
+
+
 def get_simplified_mythicness_predictors(conn):
     """Get reduced-model predictors for passage-level mythicness."""
     if not table_exists(conn, "simplified_mythicness_predictors"):
@@ -429,6 +498,7 @@ def _active_greta_prompt_version(conn, prompt_version=None):
     return versions.iloc[0]["prompt_version"]
 
 
+@_cached_per_connection
 def get_greta_sentence_annotations(conn, prompt_version=None):
     """Return active three-bucket Greta sentence annotations."""
     active_prompt = _active_greta_prompt_version(conn, prompt_version)
@@ -620,7 +690,7 @@ def get_sentence_lemma_view(conn):
     """Return each sentence with the word-level lemma stream used by analyses."""
     if not table_exists(conn, "greek_word_lemmas"):
         return pd.DataFrame()
-    lemma_lookup = load_word_lemma_lookup(conn)
+    lemma_lookup = _word_lemma_lookup(conn)
     if not lemma_lookup:
         return pd.DataFrame()
 
@@ -658,6 +728,7 @@ def get_sentence_lemma_view(conn):
     return _add_sentence_sort_columns(pd.DataFrame(rows))
 
 
+@_cached_per_connection
 def _stopword_rows(conn):
     parts = [
         "SELECT exact_form AS word FROM proper_nouns",
@@ -1248,7 +1319,7 @@ def get_greta_sentence_analysis_variants(conn):
             "bucket_counts": {},
         }
 
-    lemma_lookup = load_word_lemma_lookup(conn) if table_exists(conn, "greek_word_lemmas") else {}
+    lemma_lookup = _word_lemma_lookup(conn) if table_exists(conn, "greek_word_lemmas") else {}
     proper_stopwords = _stopword_rows(conn)
     bucket_counts = annotations["myth_history_bucket"].value_counts().sort_index().to_dict()
     book_counts = annotations["book"].value_counts().sort_index().to_dict()
@@ -2111,7 +2182,7 @@ def get_manual_label_sensitivity_analysis(
 
     proper_stopwords = proper_stopwords if proper_stopwords is not None else _stopword_rows(conn)
     lemma_lookup = lemma_lookup if lemma_lookup is not None else (
-        load_word_lemma_lookup(conn) if table_exists(conn, "greek_word_lemmas") else {}
+        _word_lemma_lookup(conn) if table_exists(conn, "greek_word_lemmas") else {}
     )
 
     gpt_scope = joined.copy()
@@ -2210,128 +2281,83 @@ def get_manual_label_sensitivity_analysis(
     }
 
 
+METRICS_TABLES = (
+    "passage_mythicness_metrics",
+    "passage_skepticism_metrics",
+    "sentence_mythicness_metrics",
+    "sentence_skepticism_metrics",
+    "simplified_mythicness_metrics",
+    "simplified_skepticism_metrics",
+    "sentence_simplified_mythicness_metrics",
+    "sentence_simplified_skepticism_metrics",
+)
+
+
+@_cached_per_connection
+def _latest_metrics(conn):
+    """Return the latest row of every metrics table, keyed by table name.
+
+    The queries are sent as one pipeline, so the eight lookups cost a single
+    round trip. Missing tables and empty tables map to None.
+    """
+    tables = [table for table in METRICS_TABLES if table_exists(conn, table)]
+    with conn.pipeline():
+        cursors = {
+            table: conn.execute(f"SELECT * FROM {table} ORDER BY id DESC LIMIT 1")
+            for table in tables
+        }
+
+    metrics = dict.fromkeys(METRICS_TABLES)
+    for table, cursor in cursors.items():
+        row = cursor.fetchone()
+        if row is not None:
+            metrics[table] = dict(zip([column.name for column in cursor.description], row))
+    return metrics
+
+
+def _metrics_for(conn, table):
+    metrics = _latest_metrics(conn)[table]
+    return dict(metrics) if metrics is not None else None
+
+
 def get_passage_mythicness_metrics(conn):
     """Get classification metrics for passage-level mythicness prediction."""
-    query = """
-    SELECT *
-    FROM passage_mythicness_metrics
-    ORDER BY id DESC
-    LIMIT 1
-    """
-    df = read_sql_query(query, conn)
-    if len(df) == 0:
-        return None
-    return df.iloc[0].to_dict()
+    return _metrics_for(conn, "passage_mythicness_metrics")
 
 
 def get_passage_skepticism_metrics(conn):
     """Get classification metrics for passage-level skepticism prediction."""
-    query = """
-    SELECT *
-    FROM passage_skepticism_metrics
-    ORDER BY id DESC
-    LIMIT 1
-    """
-    df = read_sql_query(query, conn)
-    if len(df) == 0:
-        return None
-    return df.iloc[0].to_dict()
+    return _metrics_for(conn, "passage_skepticism_metrics")
 
 
 def get_sentence_mythicness_metrics(conn):
     """Get classification metrics for sentence-level mythicness prediction."""
-    query = """
-    SELECT *
-    FROM sentence_mythicness_metrics
-    ORDER BY id DESC
-    LIMIT 1
-    """
-    df = read_sql_query(query, conn)
-    if len(df) == 0:
-        return None
-    return df.iloc[0].to_dict()
+    return _metrics_for(conn, "sentence_mythicness_metrics")
 
 
 def get_sentence_skepticism_metrics(conn):
     """Get classification metrics for sentence-level skepticism prediction."""
-    query = """
-    SELECT *
-    FROM sentence_skepticism_metrics
-    ORDER BY id DESC
-    LIMIT 1
-    """
-    df = read_sql_query(query, conn)
-    if len(df) == 0:
-        return None
-    return df.iloc[0].to_dict()
+    return _metrics_for(conn, "sentence_skepticism_metrics")
 
 
 def get_simplified_mythicness_metrics(conn):
     """Get reduced-model metrics for passage-level mythicness."""
-    if not table_exists(conn, "simplified_mythicness_metrics"):
-        return None
-
-    query = """
-    SELECT *
-    FROM simplified_mythicness_metrics
-    ORDER BY id DESC
-    LIMIT 1
-    """
-    df = read_sql_query(query, conn)
-    if len(df) == 0:
-        return None
-    return df.iloc[0].to_dict()
+    return _metrics_for(conn, "simplified_mythicness_metrics")
 
 
 def get_simplified_skepticism_metrics(conn):
     """Get reduced-model metrics for passage-level skepticism."""
-    if not table_exists(conn, "simplified_skepticism_metrics"):
-        return None
-
-    query = """
-    SELECT *
-    FROM simplified_skepticism_metrics
-    ORDER BY id DESC
-    LIMIT 1
-    """
-    df = read_sql_query(query, conn)
-    if len(df) == 0:
-        return None
-    return df.iloc[0].to_dict()
+    return _metrics_for(conn, "simplified_skepticism_metrics")
 
 
 def get_sentence_simplified_mythicness_metrics(conn):
     """Get reduced-model metrics for sentence-level mythicness."""
-    if not table_exists(conn, "sentence_simplified_mythicness_metrics"):
-        return None
-
-    query = """
-    SELECT *
-    FROM sentence_simplified_mythicness_metrics
-    ORDER BY id DESC
-    LIMIT 1
-    """
-    df = read_sql_query(query, conn)
-    if len(df) == 0:
-        return None
-    return df.iloc[0].to_dict()
+    return _metrics_for(conn, "sentence_simplified_mythicness_metrics")
 
 
 def get_sentence_simplified_skepticism_metrics(conn):
     """Get reduced-model metrics for sentence-level skepticism."""
-    if not table_exists(conn, "sentence_simplified_skepticism_metrics"):
-        return None
-
-    query = """
-    SELECT *
-    FROM sentence_simplified_skepticism_metrics
-    ORDER BY id DESC
-    LIMIT 1
-    """
-    df = read_sql_query(query, conn)
-    if len(df) == 0:
-        return None
-    return df.iloc[0].to_dict()
+    return _metrics_for(conn, "sentence_simplified_skepticism_metrics")
 
 
 def get_map_data(conn):
@@ -2341,48 +2367,41 @@ def get_map_data(conn):
     if not table_exists(conn, "wikidata_entities"):
         return []
 
-    # Get all places with coordinates
+    # Get all places with coordinates, each with the passages it appears in
     cursor.execute("""
         SELECT DISTINCT e.wikidata_qid, pn.reference_form, pn.english_transcription,
-               e.latitude, e.longitude, e.pleiades_id
+               e.latitude, e.longitude, e.pleiades_id, pp.passage_ids
         FROM proper_nouns pn
         JOIN wikidata_links w
             ON pn.reference_form = w.reference_form
             AND pn.entity_type = w.entity_type
         JOIN wikidata_entities e
             ON w.wikidata_qid = e.wikidata_qid
+        JOIN (
+            SELECT reference_form,
+                   array_agg(DISTINCT passage_id ORDER BY passage_id) AS passage_ids
+            FROM proper_nouns
+            WHERE entity_type = 'place'
+            GROUP BY reference_form
+        ) pp ON pn.reference_form = pp.reference_form
         WHERE pn.entity_type = 'place'
           AND e.latitude IS NOT NULL
           AND e.longitude IS NOT NULL
         ORDER BY pn.reference_form
     """)
-    places = cursor.fetchall()
-
-    if not places:
-        return []
-
-    # For each place, find the passages where it appears
-    map_data = []
-    for qid, reference_form, english, lat, lon, pleiades_id in places:
-        cursor.execute("""
-            SELECT DISTINCT passage_id
-            FROM proper_nouns
-            WHERE reference_form = %s AND entity_type = 'place'
-            ORDER BY passage_id
-        """, (reference_form,))
-        passage_ids = [row[0] for row in cursor.fetchall()]
 
-        map_data.append({
+    return [
+        {
             "qid": qid,
             "reference_form": reference_form,
             "english": english,
             "lat": lat,
             "lon": lon,
             "pleiades_id": pleiades_id,
-            "passages": passage_ids,
-        })
-
-    return map_data
+            "passages": list(passage_ids),
+        }
+        for qid, reference_form, english, lat, lon, pleiades_id, passage_ids in cursor.fetchall()
+    ]
 
 
 def _haversine_km(lat1, lon1, lat2, lon2):
@@ -3628,7 +3647,7 @@ def _place_matching_keys(value):
 def get_manto_pausanias_links(conn):
     """Pausanias-MANTO place links plus the labelled-but-unlinked curation queue."""
     required_tables = {"manto_releases", "manto_place_links"}
-    if not all(pg_table_exists(conn, table) for table in required_tables):
+    if not all(table_exists(conn, table) for table in required_tables):
         return {
             "available": False,
             "message": "MANTO place-link tables are not available.",
@@ -3655,7 +3674,7 @@ def get_manto_pausanias_links(conn):
 
     labels = {}
     label_counts = Counter()
-    if pg_table_exists(conn, "passage_place_state_mentions"):
+    if table_exists(conn, "passage_place_state_mentions"):
         label_rows = read_sql_query(
             """
             SELECT canonical_place_name, target_label, count(*) AS mention_count
@@ -3685,7 +3704,7 @@ def get_manto_pausanias_links(conn):
                 labels[key] = (label, name, total)
 
     curated_decisions = {}
-    if pg_table_exists(conn, "curated_place_links"):
+    if table_exists(conn, "curated_place_links"):
         curated_rows = read_sql_query(
             "SELECT place_name, manto_id, source, rationale, rejected FROM curated_place_links",
             conn,
@@ -3947,7 +3966,7 @@ def get_manto_place_survival_model(conn):
         "place_survival_model_runs",
         "place_survival_feature_scores",
     }
-    if not all(pg_table_exists(conn, table) for table in required_tables):
+    if not all(table_exists(conn, table) for table in required_tables):
         return {
             "available": False,
             "message": "Place-survival model tables are not available.",
@@ -4186,8 +4205,8 @@ def get_manto_place_survival_model(conn):
 
     coverage = {}
     if (
-        pg_table_exists(conn, "passages")
-        and pg_table_exists(conn, "passage_place_state_reviews")
+        table_exists(conn, "passages")
+        and table_exists(conn, "passage_place_state_reviews")
     ):
         coverage_rows = read_sql_query(
             """
@@ -4239,13 +4258,10 @@ def get_translation_page_data(conn):
                p.references_mythic_era, p.expresses_scepticism
         FROM passages p
         LEFT JOIN translations t ON p.id = t.passage_id
-        ORDER BY p.id
+        ORDER BY string_to_array(p.id, '.')::int[]
     """)
     passages_raw = cursor.fetchall()
 
-    # Sort by numeric passage ID
-    passages_raw.sort(key=lambda r: passage_id_sort_key(r[0]))
-
     # Build ordered passage list
     passages = []
     for pid, greek, english, is_mythic, is_skeptical in passages_raw:
@@ -4262,7 +4278,9 @@ def get_translation_page_data(conn):
 
     if has_wikidata:
         cursor.execute("""
-            SELECT pn.passage_id, pn.reference_form, pn.english_transcription,
+            SELECT DISTINCT ON (string_to_array(pn.passage_id, '.')::int[],
+                                pn.entity_type, pn.reference_form)
+                   pn.passage_id, pn.reference_form, pn.english_transcription,
                    pn.entity_type, w.wikidata_qid, e.latitude, e.longitude,
                    e.pleiades_id
             FROM proper_nouns pn
@@ -4271,16 +4289,21 @@ def get_translation_page_data(conn):
                 AND pn.entity_type = w.entity_type
             LEFT JOIN wikidata_entities e
                 ON w.wikidata_qid = e.wikidata_qid
-            ORDER BY pn.passage_id, pn.entity_type, pn.reference_form
+            ORDER BY string_to_array(pn.passage_id, '.')::int[],
+                     pn.entity_type, pn.reference_form
         """)
     else:
         cursor.execute("""
-            SELECT passage_id, reference_form, english_transcription,
+            SELECT DISTINCT ON (string_to_array(passage_id, '.')::int[],
+                                entity_type, reference_form)
+                   passage_id, reference_form, english_transcription,
                    entity_type, NULL, NULL, NULL, NULL
             FROM proper_nouns
-            ORDER BY passage_id, entity_type, reference_form
+            ORDER BY string_to_array(passage_id, '.')::int[],
+                     entity_type, reference_form
         """)
 
+    # DISTINCT ON leaves one row per noun per passage, in reading order
     noun_rows = cursor.fetchall()
 
     # Group nouns by passage_id
@@ -4289,10 +4312,7 @@ def get_translation_page_data(conn):
     noun_passages = {}
 
     for passage_id, ref_form, english, entity_type, qid, lat, lon, pleiades_id in noun_rows:
-        if passage_id not in nouns_by_passage:
-            nouns_by_passage[passage_id] = []
-
-        noun_entry = {
+        nouns_by_passage.setdefault(passage_id, []).append({
             "reference_form": ref_form,
             "english": english,
             "entity_type": entity_type,
@@ -4300,22 +4320,11 @@ def get_translation_page_data(conn):
             "lat": lat,
             "lon": lon,
             "pleiades_id": pleiades_id,
-        }
-
-        # Avoid duplicates within a passage
-        if not any(n["reference_form"] == ref_form and n["entity_type"] == entity_type
-                   for n in nouns_by_passage[passage_id]):
-            nouns_by_passage[passage_id].append(noun_entry)
-
-        # Build cross-reference
-        key = (ref_form, entity_type)
-        if key not in noun_passages:
-            noun_passages[key] = set()
-        noun_passages[key].add(passage_id)
+        })
 
-    # Convert cross-reference sets to sorted lists
-    noun_passages = {k: sorted(v, key=passage_id_sort_key)
-                     for k, v in noun_passages.items()}
+        # Build cross-reference; rows arrive in passage order, so each list
+        # is already sorted
+        noun_passages.setdefault((ref_form, entity_type), []).append(passage_id)
 
     return passages, nouns_by_passage, noun_passages
 
@@ -6982,7 +6991,7 @@ def get_sentence_translation_bucket_analysis(conn):
 
     greek_stop_words = None
     if table_exists(conn, "greek_word_lemmas"):
-        lemma_lookup = load_word_lemma_lookup(conn)
+        lemma_lookup = _word_lemma_lookup(conn)
         if lemma_lookup:
             lemma_texts, _ = build_lemma_texts(df["sentence"], lemma_lookup)
             df = df.copy()
@@ -7015,14 +7024,12 @@ def get_translation_length_analysis(conn):
     JOIN translations t ON p.id = t.passage_id
     WHERE t.english_translation IS NOT NULL
       AND btrim(t.english_translation) <> ''
-    ORDER BY p.id
+    ORDER BY string_to_array(p.id, '.')::int[]
     """
     df = read_sql_query(query, conn)
     if len(df) > 0:
-        df["sort_key"] = df["id"].apply(passage_id_sort_key)
-        df = df.sort_values("sort_key").drop(columns=["sort_key"])
         if table_exists(conn, "greek_word_lemmas"):
-            lemma_lookup = load_word_lemma_lookup(conn)
+            lemma_lookup = _word_lemma_lookup(conn)
             if lemma_lookup:
                 lemma_texts, _ = build_lemma_texts(df["passage"], lemma_lookup)
                 df = df.copy()
@@ -7094,11 +7101,14 @@ def get_progress_data(conn):
         )
 
     def predictor_done(*table_names):
-        done = 0
-        for table_name in table_names:
-            if table_exists(conn, table_name) and fetch_scalar(f"SELECT COUNT(*) FROM {table_name}") > 0:
-                done += 1
-        return done
+        # One query: how many of the existing tables have any rows
+        existing = [table_name for table_name in table_names if table_exists(conn, table_name)]
+        if not existing:
+            return 0
+        return fetch_scalar(
+            "SELECT "
+            + " + ".join(f"(EXISTS (SELECT 1 FROM {table_name}))::int" for table_name in existing)
+        )
 
     def add_task(
         *,
@@ -7159,16 +7169,24 @@ def get_progress_data(conn):
             }
         )
 
-    total_passages = fetch_scalar("SELECT COUNT(*) FROM passages")
-    total_sentences = count_if_table("greek_sentences", "SELECT COUNT(*) FROM greek_sentences") or 0
-    passages_with_sentences = count_if_table(
-        "greek_sentences",
-        "SELECT COUNT(DISTINCT passage_id) FROM greek_sentences",
-    ) or 0
-    total_nouns = count_if_table(
-        "proper_nouns",
-        "SELECT COUNT(DISTINCT reference_form || '|' || entity_type) FROM proper_nouns",
-    ) or 0
+    # Headline totals in one round trip; missing tables count as zero
+    has_sentences = table_exists(conn, "greek_sentences")
+    has_nouns = table_exists(conn, "proper_nouns")
+    sentence_counts = (
+        "(SELECT COUNT(*) FROM greek_sentences), "
+        "(SELECT COUNT(DISTINCT passage_id) FROM greek_sentences)"
+        if has_sentences
+        else "0, 0"
+    )
+    noun_count = (
+        "(SELECT COUNT(DISTINCT reference_form || '|' || entity_type) FROM proper_nouns)"
+        if has_nouns
+        else "0"
+    )
+    cursor.execute(
+        f"SELECT (SELECT COUNT(*) FROM passages), {sentence_counts}, {noun_count}"
+    )
+    total_passages, total_sentences, passages_with_sentences, total_nouns = cursor.fetchone()
 
     if passages_with_sentences and total_sentences:
         sentence_total_target = total_sentences
@@ -7559,12 +7577,6 @@ def add_phrase_translations(df: pd.DataFrame, conn, client: Optional[OpenAI] = N
     Returns:
         Dataframe with added 'english_translation' and 'is_proper_noun' columns
     """
-    import sys
-    import os
-    # Add parent directory to path to import phrase_translator
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from phrase_translator import get_translations_for_phrases
-
     if 'phrase' not in df.columns:
         raise ValueError("Dataframe must have a 'phrase' column")
 
@@ -7574,13 +7586,13 @@ def add_phrase_translations(df: pd.DataFrame, conn, client: Optional[OpenAI] = N
     # Get translations (returns dict of phrase -> (translation, is_proper_noun))
     translations = get_translations_for_phrases(conn, client, model, phrases)
 
-    # Add columns
-    df = df.copy()
-    df['english_translation'] = df['phrase'].map(lambda p: translations.get(p, ('', False))[0])
-    df['is_proper_noun'] = df['phrase'].map(lambda p: translations.get(p, ('', False))[1])
+    english_by_phrase = {phrase: value[0] for phrase, value in translations.items()}
+    proper_noun_by_phrase = {phrase: value[1] for phrase, value in translations.items()}
 
-    # Fill any missing values
-    df['english_translation'] = df['english_translation'].fillna('')
-    df['is_proper_noun'] = df['is_proper_noun'].fillna(False)
+    # Add columns, filling phrases that have no translation
+    df = df.assign(
+        english_translation=df['phrase'].map(english_by_phrase).fillna(''),
+        is_proper_noun=df['phrase'].map(proper_noun_by_phrase).fillna(False),
+    )
 
     return df
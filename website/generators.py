@@ -1,5 +1,7 @@
 """HTML page generator functions."""
 
+import contextlib
+import functools
 import json
 import os
 import html
@@ -7,10 +9,11 @@ import math
 import re
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from manto_place_feature_catalog import FEATURE_BY_NAME, FEATURE_CATALOG
-from .highlighting import highlight_passage
+from .highlighting import compile_predictor_patterns, highlight_passage
 
 GRAPHIC_PASSAGE_IMAGE_RE = re.compile(
     r"^(?P<section>\d+)\.(?:png|jpg|jpeg|webp)$", re.IGNORECASE
@@ -43,8 +46,12 @@ LEGACY_NAV_ACTIVE_MAP = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def _site_nav(prefix="", active=None):
-    """Generate the compact site-wide nav with links relative to the root."""
+    """Generate the compact site-wide nav with links relative to the root.
+
+    Cached: every page at the same depth and section gets the same nav.
+    """
     active_key = LEGACY_NAV_ACTIVE_MAP.get(active, active)
     parts = []
     for href, label, key in SITE_NAV_LINKS:
@@ -141,6 +148,30 @@ PREDICTOR_TABLE_SORT_SCRIPT = """
 """
 
 
+# Chapter pages are built on the main thread and handed to a small pool of
+# writer threads, so file I/O overlaps with building the next chapter.
+PAGE_WRITE_WORKERS = 4
+
+
+def _write_html_file(path, content):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+@contextlib.contextmanager
+def _page_writer():
+    """Yield a write_page(path, content) that writes on the pool's threads.
+
+    Leaving the block waits for every write and re-raises the first write
+    error; an error while building pages still shuts the pool down.
+    """
+    writes = []
+    with ThreadPoolExecutor(max_workers=PAGE_WRITE_WORKERS) as writer:
+        yield lambda path, content: writes.append(writer.submit(_write_html_file, path, content))
+    for write in writes:
+        write.result()
+
+
 def write_redirect_page(output_dir, filename, target, title):
     """Write a lightweight compatibility redirect for older flat URLs."""
     redirect_html = f"""<!DOCTYPE html>
@@ -215,6 +246,19 @@ def format_classification_metrics(metrics, class_0_label, class_1_label):
     return html_content
 
 
+PREDICTOR_ROW_TEMPLATE = """
+                    <tr>
+                        <td class="{word_class}">{phrase}</td>
+                        <td>{english}</td>
+                        <td data-sort-key="coefficient" data-sort-value="{coefficient:.16g}">{coefficient:.4f}</td>
+                        <td>{positive_count}</td>
+                        <td>{negative_count}</td>
+                        <td>{p_value:.3g}</td>
+                        <td data-sort-key="q_value" data-sort-value="{q_value:.16g}">{q_value:.3g}</td>
+                    </tr>
+        """
+
+
 def render_predictor_table(
     table_id,
     rows,
@@ -226,7 +270,7 @@ def render_predictor_table(
     coefficient_direction="desc",
 ):
     """Render a sortable predictor table."""
-    table_html = f"""
+    parts = [f"""
             <div class="predictor-sort-controls" data-predictor-sort-controls data-table-id="{table_id}" data-default-mode="coefficient" data-coefficient-direction="{coefficient_direction}">
                 <span>Sort by:</span>
                 <button type="button" class="predictor-sort-button" data-sort-mode="coefficient">Coefficient</button>
@@ -246,27 +290,43 @@ def render_predictor_table(
                     </tr>
                 </thead>
                 <tbody>
-    """
+    """]
 
-    for _, row in rows.iterrows():
-        english = row.get("english_translation", "")
-        table_html += f"""
-                    <tr>
-                        <td class="{word_class}">{html.escape(row['phrase'])}</td>
-                        <td>{html.escape(english)}</td>
-                        <td data-sort-key="coefficient" data-sort-value="{row['coefficient']:.16g}">{row['coefficient']:.4f}</td>
-                        <td>{row[positive_count_column]}</td>
-                        <td>{row[negative_count_column]}</td>
-                        <td>{row['p_value']:.3g}</td>
-                        <td data-sort-key="q_value" data-sort-value="{row['q_value']:.16g}">{row['q_value']:.3g}</td>
-                    </tr>
-        """
+    # Escape whole columns up front and unbox the numeric ones to plain Python
+    # numbers, then fill one row template per predictor
+    phrases = rows["phrase"].map(html.escape)
+    if "english_translation" in rows:
+        englishes = rows["english_translation"].fillna("").map(html.escape)
+    else:
+        englishes = [""] * len(rows)
+    row_format = PREDICTOR_ROW_TEMPLATE.format
+    parts.extend(
+        row_format(
+            word_class=word_class,
+            phrase=phrase,
+            english=english,
+            coefficient=coefficient,
+            positive_count=positive_count,
+            negative_count=negative_count,
+            p_value=p_value,
+            q_value=q_value,
+        )
+        for phrase, english, coefficient, positive_count, negative_count, p_value, q_value in zip(
+            phrases,
+            englishes,
+            rows["coefficient"].tolist(),
+            rows[positive_count_column].tolist(),
+            rows[negative_count_column].tolist(),
+            rows["p_value"].tolist(),
+            rows["q_value"].tolist(),
+        )
+    )
 
-    table_html += """
+    parts.append("""
                 </tbody>
             </table>
-    """
-    return table_html
+    """)
+    return "".join(parts)
 
 
 def render_confusion_matrix_card(title, metrics, class_0_label, class_1_label, prefix=""):
@@ -6103,20 +6163,73 @@ def generate_network_analysis_pages(network_analysis, output_dir, title):
         f.write(index_page)
 
 
-def generate_mythic_page(passages_df, mythic_color_map, mythic_class_map, proper_nouns_dict, output_dir, title):
-    """Generate pages showing mythic aspects of passages grouped by chapter."""
+# Legends shared by every chapter page of the mythic and skepticism views
+MYTHIC_LEGEND_HTML = """<div class="legend">
+                <h3>Legend:</h3>
+                <div class="legend-item">
+                    <span class="color-sample mythic-sample"></span> Mythic content (warmer colors, <span class="mythic">italics</span>)
+                </div>
+                <div class="legend-item">
+                    <span class="color-sample historical-sample"></span> Historical content (cooler colors)
+                </div>
+                <p>Color intensity indicates the strength of the predictive word or phrase.</p>
+            </div>"""
+
+SKEPTIC_LEGEND_HTML = """<div class="legend">
+                <h3>Legend:</h3>
+                <div class="legend-item">
+                    <span class="color-sample skeptical-sample"></span> Skeptical content (green)
+                </div>
+                <div class="legend-item">
+                    <span class="color-sample non-skeptical-sample"></span> Non-skeptical content (orange, <strong>bold</strong>)
+                </div>
+                <p>Color intensity indicates the strength of the predictive word or phrase.</p>
+            </div>"""
+
+
+@functools.lru_cache(maxsize=None)
+def _proper_noun_tags_html(proper_nouns):
+    """Render a chapter-page passage's proper-noun tags.
 
-    passages_df = passages_df.copy()
-    passages_df['chapter'] = passages_df['id'].apply(lambda pid: '.'.join(pid.split('.')[:2]))
-    chapters = sorted(passages_df['chapter'].unique(), key=lambda c: [int(p) for p in c.split('.')])
+    Cached on the tuple of nouns, so the mythic and skepticism pages escape
+    each passage's nouns only once between them. The nouns arrive already
+    sorted from get_proper_nouns_by_passage.
+    """
+    if not proper_nouns:
+        return ""
+    parts = ["""
+                        <div class=\"proper-nouns\">
+                            <div class=\"proper-noun-header\">Proper Nouns:</div>
+            """]
+    for noun in proper_nouns:
+        parts.append(f"""
+                            <span class=\"proper-noun-tag\">{html.escape(noun)}</span>
+                """)
+    parts.append("""
+                        </div>
+                """)
+    return "".join(parts)
+
+
+def generate_mythic_page(chapter_passages, mythic_color_map, mythic_class_map, proper_nouns_dict, output_dir, title):
+    """Generate pages showing mythic aspects of passages grouped by chapter.
+
+    ``chapter_passages`` is the (chapter, passages) list from
+    split_passages_by_chapter, shared with generate_skepticism_page.
+    """
+
+    timestamp = datetime.now().strftime("%Y-%m-%d at %H:%M:%S")
 
     mythic_dir = os.path.join(output_dir, 'mythic')
     os.makedirs(mythic_dir, exist_ok=True)
+    patterns = compile_predictor_patterns(mythic_color_map)
 
     # Create chapter pages
-    for chapter in chapters:
-        chapter_passages = passages_df[passages_df['chapter'] == chapter]
-        html_content = f"""<!DOCTYPE html>
+    # Each chapter's file name serves both its page and the index link
+    chapter_filenames = [f"{chapter.replace('.', '_')}.html" for chapter, _ in chapter_passages]
+    with _page_writer() as write_page:
+        for (chapter, chapter_df), filename in zip(chapter_passages, chapter_filenames):
+            parts = [f"""<!DOCTYPE html>
     <html lang=\"en\">
     <head>
         <meta charset=\"UTF-8\">
@@ -6133,36 +6246,28 @@ def generate_mythic_page(passages_df, mythic_color_map, mythic_class_map, proper
         {_site_nav("../", "annotations")}
 
         <div class=\"container\">
-            <div class=\"legend\">
-                <h3>Legend:</h3>
-                <div class=\"legend-item\">
-                    <span class=\"color-sample mythic-sample\"></span> Mythic content (warmer colors, <span class=\"mythic\">italics</span>)
-                </div>
-                <div class=\"legend-item\">
-                    <span class=\"color-sample historical-sample\"></span> Historical content (cooler colors)
-                </div>
-                <p>Color intensity indicates the strength of the predictive word or phrase.</p>
-            </div>
+            {MYTHIC_LEGEND_HTML}
 
             <h2>Chapter {chapter}</h2>
-    """
-
-        for _, row in chapter_passages.iterrows():
-            passage_id = row['id']
-            passage_text = row['passage']
-            is_mythic = row['references_mythic_era']
-            translation = row.get('english_translation', None)
-            proper_nouns = proper_nouns_dict.get(passage_id, [])
-
-            highlighted_passage = highlight_passage(
-                passage_text,
-                mythic_color_map,
-                mythic_color_map,
-                mythic_class_map,
-                is_mythic_page=True
-            )
+    """]
+
+            for row in chapter_df.itertuples(index=False):
+                passage_id = row.id
+                passage_text = row.passage
+                is_mythic = row.references_mythic_era
+                translation = getattr(row, 'english_translation', '')
+                proper_nouns = proper_nouns_dict.get(passage_id, [])
+
+                highlighted_passage = highlight_passage(
+                    passage_text,
+                    mythic_color_map,
+                    mythic_color_map,
+                    mythic_class_map,
+                    is_mythic_page=True,
+                    patterns=patterns,
+                )
 
-            html_content += f"""
+                parts.append(f"""
             <div class=\"passage\">
                 <div class=\"passage-header\">
                     <span class=\"passage-id\">Passage {passage_id}</span>
@@ -6171,51 +6276,36 @@ def generate_mythic_page(passages_df, mythic_color_map, mythic_class_map, proper
                 <div class=\"passage-container\">
                      <div class=\"greek-text\">
                          {highlighted_passage}
-        """
-
-            if proper_nouns:
-                html_content += f"""
-                        <div class=\"proper-nouns\">
-                            <div class=\"proper-noun-header\">Proper Nouns:</div>
-            """
-
-                for noun in sorted(proper_nouns):
-                    html_content += f"""
-                            <span class=\"proper-noun-tag\">{html.escape(noun)}</span>
-                """
+        """)
 
-                html_content += """
-                        </div>
-                """
+                parts.append(_proper_noun_tags_html(tuple(proper_nouns)))
 
-            html_content += """
+                parts.append("""
                      </div>
-        """
+        """)
 
-            if translation and not pd.isna(translation):
-                html_content += f"""
+                if translation:
+                    parts.append(f"""
                     <div class=\"english-translation\">
                         {translation}
                     </div>
-            """
+            """)
 
-            html_content += """
+                parts.append("""
                 </div>
             </div>
-        """
+        """)
 
-        html_content += f"""
+            parts.append(f"""
             <footer>
-                Generated on {datetime.now().strftime("%Y-%m-%d at %H:%M:%S")} from the PostgreSQL database
+                Generated on {timestamp} from the PostgreSQL database
             </footer>
         </div>
     </body>
     </html>
-    """
+    """)
 
-        filename = f"{chapter.replace('.', '_')}.html"
-        with open(os.path.join(mythic_dir, filename), 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            write_page(os.path.join(mythic_dir, filename), "".join(parts))
 
     # Create index page linking to chapters
     index_content = f"""<!DOCTYPE html>
@@ -6239,14 +6329,15 @@ def generate_mythic_page(passages_df, mythic_color_map, mythic_class_map, proper
             <ul>
     """
 
-    for chapter in chapters:
-        filename = f"{chapter.replace('.', '_')}.html"
-        index_content += f"<li><a href=\"{filename}\">Chapter {chapter}</a></li>\n"
+    index_content += "".join(
+        f"<li><a href=\"{filename}\">Chapter {chapter}</a></li>\n"
+        for (chapter, _), filename in zip(chapter_passages, chapter_filenames)
+    )
 
     index_content += """
             </ul>
             <footer>
-                Generated on """ + datetime.now().strftime("%Y-%m-%d at %H:%M:%S") + """ from the PostgreSQL database
+                Generated on """ + timestamp + """ from the PostgreSQL database
             </footer>
         </div>
     </body>
@@ -6258,19 +6349,24 @@ def generate_mythic_page(passages_df, mythic_color_map, mythic_class_map, proper
 
     write_redirect_page(output_dir, "mythic.html", "mythic/index.html", "Mythic Analysis")
 
-def generate_skepticism_page(passages_df, skeptic_color_map, skeptic_class_map, proper_nouns_dict, output_dir, title):
-    """Generate pages showing skeptical aspects of passages grouped by chapter."""
+def generate_skepticism_page(chapter_passages, skeptic_color_map, skeptic_class_map, proper_nouns_dict, output_dir, title):
+    """Generate pages showing skeptical aspects of passages grouped by chapter.
 
-    passages_df = passages_df.copy()
-    passages_df['chapter'] = passages_df['id'].apply(lambda pid: '.'.join(pid.split('.')[:2]))
-    chapters = sorted(passages_df['chapter'].unique(), key=lambda c: [int(p) for p in c.split('.')])
+    ``chapter_passages`` is the (chapter, passages) list from
+    split_passages_by_chapter, shared with generate_mythic_page.
+    """
+
+    timestamp = datetime.now().strftime("%Y-%m-%d at %H:%M:%S")
 
     skeptic_dir = os.path.join(output_dir, 'skepticism')
     os.makedirs(skeptic_dir, exist_ok=True)
+    patterns = compile_predictor_patterns(skeptic_color_map)
 
-    for chapter in chapters:
-        chapter_passages = passages_df[passages_df['chapter'] == chapter]
-        html_content = f"""<!DOCTYPE html>
+    # Each chapter's file name serves both its page and the index link
+    chapter_filenames = [f"{chapter.replace('.', '_')}.html" for chapter, _ in chapter_passages]
+    with _page_writer() as write_page:
+        for (chapter, chapter_df), filename in zip(chapter_passages, chapter_filenames):
+            parts = [f"""<!DOCTYPE html>
     <html lang=\"en\">
     <head>
         <meta charset=\"UTF-8\">
@@ -6287,36 +6383,28 @@ def generate_skepticism_page(passages_df, skeptic_color_map, skeptic_class_map,
         {_site_nav("../", "annotations")}
 
         <div class=\"container\">
-            <div class=\"legend\">
-                <h3>Legend:</h3>
-                <div class=\"legend-item\">
-                    <span class=\"color-sample skeptical-sample\"></span> Skeptical content (green)
-                </div>
-                <div class=\"legend-item\">
-                    <span class=\"color-sample non-skeptical-sample\"></span> Non-skeptical content (orange, <strong>bold</strong>)
-                </div>
-                <p>Color intensity indicates the strength of the predictive word or phrase.</p>
-            </div>
+            {SKEPTIC_LEGEND_HTML}
 
             <h2>Chapter {chapter}</h2>
-    """
-
-        for _, row in chapter_passages.iterrows():
-            passage_id = row['id']
-            passage_text = row['passage']
-            is_skeptical = row['expresses_scepticism']
-            translation = row.get('english_translation', None)
-            proper_nouns = proper_nouns_dict.get(passage_id, [])
-
-            highlighted_passage = highlight_passage(
-                passage_text,
-                skeptic_color_map,
-                skeptic_color_map,
-                skeptic_class_map,
-                is_mythic_page=False
-            )
+    """]
+
+            for row in chapter_df.itertuples(index=False):
+                passage_id = row.id
+                passage_text = row.passage
+                is_skeptical = row.expresses_scepticism
+                translation = getattr(row, 'english_translation', '')
+                proper_nouns = proper_nouns_dict.get(passage_id, [])
+
+                highlighted_passage = highlight_passage(
+                    passage_text,
+                    skeptic_color_map,
+                    skeptic_color_map,
+                    skeptic_class_map,
+                    is_mythic_page=False,
+                    patterns=patterns,
+                )
 
-            html_content += f"""
+                parts.append(f"""
             <div class=\"passage\">
                 <div class=\"passage-header\">
                     <span class=\"passage-id\">Passage {passage_id}</span>
@@ -6325,51 +6413,36 @@ def generate_skepticism_page(passages_df, skeptic_color_map, skeptic_class_map,
                 <div class=\"passage-container\">
                    <div class=\"greek-text\">
                     {highlighted_passage}
-        """
-
-            if proper_nouns:
-                html_content += f"""
-                        <div class=\"proper-nouns\">
-                            <div class=\"proper-noun-header\">Proper Nouns:</div>
-            """
+        """)
 
-                for noun in sorted(proper_nouns):
-                    html_content += f"""
-                            <span class=\"proper-noun-tag\">{html.escape(noun)}</span>
-                """
+                parts.append(_proper_noun_tags_html(tuple(proper_nouns)))
 
-                html_content += """
-                        </div>
-                """
-
-            html_content += """
+                parts.append("""
                    </div>
-        """
+        """)
 
-            if translation and not pd.isna(translation):
-                html_content += f"""
+                if translation:
+                    parts.append(f"""
                     <div class=\"english-translation\">
                         {translation}
                     </div>
-            """
+            """)
 
-            html_content += """
+                parts.append("""
             </div>
         </div>
-        """
+        """)
 
-        html_content += f"""
+            parts.append(f"""
             <footer>
-                Generated on {datetime.now().strftime("%Y-%m-%d at %H:%M:%S")} from the PostgreSQL database
+                Generated on {timestamp} from the PostgreSQL database
             </footer>
         </div>
     </body>
     </html>
-    """
+    """)
 
-        filename = f"{chapter.replace('.', '_')}.html"
-        with open(os.path.join(skeptic_dir, filename), 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            write_page(os.path.join(skeptic_dir, filename), "".join(parts))
 
     # Create index page linking to chapters
     index_content = f"""<!DOCTYPE html>
@@ -6393,14 +6466,15 @@ def generate_skepticism_page(passages_df, skeptic_color_map, skeptic_class_map,
             <ul>
     """
 
-    for chapter in chapters:
-        filename = f"{chapter.replace('.', '_')}.html"
-        index_content += f"<li><a href=\"{filename}\">Chapter {chapter}</a></li>\n"
+    index_content += "".join(
+        f"<li><a href=\"{filename}\">Chapter {chapter}</a></li>\n"
+        for (chapter, _), filename in zip(chapter_passages, chapter_filenames)
+    )
 
     index_content += """
             </ul>
             <footer>
-                Generated on """ + datetime.now().strftime("%Y-%m-%d at %H:%M:%S") + """ from the PostgreSQL database
+                Generated on """ + timestamp + """ from the PostgreSQL database
             </footer>
         </div>
     </body>
@@ -6412,13 +6486,9 @@ def generate_skepticism_page(passages_df, skeptic_color_map, skeptic_class_map,
 
     write_redirect_page(output_dir, "skepticism.html", "skepticism/index.html", "Skepticism Analysis")
 
-def generate_mythic_words_page(mythic_predictors, output_dir, title, metrics=None, simplified_predictors=None, simplified_metrics=None):
+def generate_mythic_words_page(mythic_words, historical_words, output_dir, title, metrics=None, simplified_predictors=None, simplified_metrics=None):
     """Generate a page showing words and phrases that predict mythic/historical content."""
 
-    # Split into mythic and historical predictors
-    mythic_words = mythic_predictors[mythic_predictors['is_mythic'] == 1].sort_values('coefficient', ascending=False)
-    historical_words = mythic_predictors[mythic_predictors['is_mythic'] == 0].sort_values('coefficient', ascending=True)
-
     html_content = f"""<!DOCTYPE html>
     <html lang="en">
     <head>
@@ -6489,13 +6559,9 @@ def generate_mythic_words_page(mythic_predictors, output_dir, title, metrics=Non
     with open(os.path.join(output_dir, 'mythic_words.html'), 'w', encoding='utf-8') as f:
         f.write(html_content)
 
-def generate_skeptic_words_page(skeptic_predictors, output_dir, title, metrics=None, simplified_predictors=None, simplified_metrics=None):
+def generate_skeptic_words_page(skeptical_words, non_skeptical_words, output_dir, title, metrics=None, simplified_predictors=None, simplified_metrics=None):
     """Generate a page showing words and phrases that predict skeptical/non-skeptical content."""
 
-    # Split into skeptical and non-skeptical predictors
-    skeptical_words = skeptic_predictors[skeptic_predictors['is_skeptical'] == 1].sort_values('coefficient', ascending=False)
-    non_skeptical_words = skeptic_predictors[skeptic_predictors['is_skeptical'] == 0].sort_values('coefficient', ascending=True)
-
     html_content = f"""<!DOCTYPE html>
     <html lang="en">
     <head>
@@ -6566,12 +6632,9 @@ def generate_skeptic_words_page(skeptic_predictors, output_dir, title, metrics=N
         f.write(html_content)
 
 
-def generate_sentence_mythic_words_page(mythic_predictors, output_dir, title, metrics=None, simplified_predictors=None, simplified_metrics=None):
+def generate_sentence_mythic_words_page(mythic_words, historical_words, output_dir, title, metrics=None, simplified_predictors=None, simplified_metrics=None):
     """Generate a page showing sentence-level predictors of mythic/historical content."""
 
-    mythic_words = mythic_predictors[mythic_predictors['is_mythic'] == 1].sort_values('coefficient', ascending=False)
-    historical_words = mythic_predictors[mythic_predictors['is_mythic'] == 0].sort_values('coefficient', ascending=True)
-
     html_content = f"""<!DOCTYPE html>
     <html lang="en">
     <head>
@@ -6639,12 +6702,9 @@ def generate_sentence_mythic_words_page(mythic_predictors, output_dir, title, me
         f.write(html_content)
 
 
-def generate_sentence_skeptic_words_page(skeptic_predictors, output_dir, title, metrics=None, simplified_predictors=None, simplified_metrics=None):
+def generate_sentence_skeptic_words_page(skeptical_words, non_skeptical_words, output_dir, title, metrics=None, simplified_predictors=None, simplified_metrics=None):
     """Generate a page showing sentence-level predictors of skepticism."""
 
-    skeptical_words = skeptic_predictors[skeptic_predictors['is_skeptical'] == 1].sort_values('coefficient', ascending=False)
-    non_skeptical_words = skeptic_predictors[skeptic_predictors['is_skeptical'] == 0].sort_values('coefficient', ascending=True)
-
     html_content = f"""<!DOCTYPE html>
     <html lang="en">
     <head>
@@ -6712,11 +6772,29 @@ def generate_sentence_skeptic_words_page(skeptic_predictors, output_dir, title,
         f.write(html_content)
 
 
+def _flag_labels(flags, true_label, false_label):
+    """Label a nullable boolean column, with '?' for missing values."""
+    missing = flags.isna()
+    return np.where(
+        missing, "?", np.where(flags.mask(missing, False).astype(bool), true_label, false_label)
+    )
+
+
 def generate_sentences_page(sentences_df, output_dir, title):
     """Generate pages listing Greek passages split into sentences, grouped by chapter."""
 
+    timestamp = datetime.now().strftime("%Y-%m-%d at %H:%M:%S")
+
     sentences_df = sentences_df.copy()
-    sentences_df["chapter"] = sentences_df["passage_id"].apply(lambda pid: ".".join(pid.split(".")[:2]))
+    sentences_df["chapter"] = sentences_df["passage_id"].str.extract(r"^(\d+\.\d+)", expand=False)
+    # Escape the text columns and label the flags once, not cell by cell
+    # inside the row loop
+    for column in ("passage_id", "sentence", "english_sentence"):
+        sentences_df[column] = sentences_df[column].map(html.escape)
+    sentences_df["era"] = _flag_labels(sentences_df["references_mythic_era"], "Mythic", "Historical")
+    sentences_df["sceptic"] = _flag_labels(
+        sentences_df["expresses_scepticism"], "Skeptical", "Not Skeptical"
+    )
     chapters = sorted(
         sentences_df["chapter"].unique(),
         key=lambda c: [int(p) for p in c.split(".")],
@@ -6725,10 +6803,14 @@ def generate_sentences_page(sentences_df, output_dir, title):
     sentences_dir = os.path.join(output_dir, "sentences")
     os.makedirs(sentences_dir, exist_ok=True)
 
-    # Create chapter pages
+    # Create chapter pages, splitting the frame once rather than per chapter
+    chapter_groups = dict(tuple(sentences_df.groupby("chapter", sort=False)))
     for chapter in chapters:
-        chapter_df = sentences_df[sentences_df["chapter"] == chapter]
-        html_content = f"""<!DOCTYPE html>
+        chapter_df = chapter_groups[chapter]
+        filename = f"{chapter.replace('.', '_')}.html"
+        # Stream each row to the file rather than growing one page string
+        with open(os.path.join(sentences_dir, filename), "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write(f"""<!DOCTYPE html>
 <html lang=\"en\">
 <head>
     <meta charset=\"UTF-8\">
@@ -6758,47 +6840,31 @@ def generate_sentences_page(sentences_df, output_dir, title):
                 </tr>
             </thead>
             <tbody>
-"""
-
-        for _, row in chapter_df.iterrows():
-            if pd.isna(row["references_mythic_era"]):
-                era = "?"
-            else:
-                era = "Mythic" if row["references_mythic_era"] else "Historical"
-
-            if pd.isna(row["expresses_scepticism"]):
-                sceptic = "?"
-            else:
-                sceptic = (
-                    "Skeptical" if row["expresses_scepticism"] else "Not Skeptical"
-                )
+""")
 
-            html_content += f"""
+            for row in chapter_df.itertuples(index=False):
+                f.write(f"""
                 <tr>
-                    <td>{html.escape(row['passage_id'])}</td>
-                    <td>{row['sentence_number']}</td>
-                    <td>{html.escape(row['sentence'])}</td>
-                    <td>{html.escape(row['english_sentence'])}</td>
-                    <td>{era}</td>
-                    <td>{sceptic}</td>
+                    <td>{row.passage_id}</td>
+                    <td>{row.sentence_number}</td>
+                    <td>{row.sentence}</td>
+                    <td>{row.english_sentence}</td>
+                    <td>{row.era}</td>
+                    <td>{row.sceptic}</td>
                 </tr>
-"""
+""")
 
-        html_content += f"""
+            f.write(f"""
             </tbody>
         </table>
 
         <footer>
-            Generated on {datetime.now().strftime("%Y-%m-%d at %H:%M:%S")} from the PostgreSQL database
+            Generated on {timestamp} from the PostgreSQL database
         </footer>
     </div>
 </body>
 </html>
-"""
-
-        filename = f"{chapter.replace('.', '_')}.html"
-        with open(os.path.join(sentences_dir, filename), "w", encoding="utf-8") as f:
-            f.write(html_content)
+""")
 
     # Create index page linking to chapters
     index_content = f"""<!DOCTYPE html>
@@ -6822,14 +6888,15 @@ def generate_sentences_page(sentences_df, output_dir, title):
         <ul>
 """
 
-    for chapter in chapters:
-        filename = f"{chapter.replace('.', '_')}.html"
-        index_content += f"            <li><a href=\"{filename}\">Chapter {chapter}</a></li>\n"
+    index_content += "".join(
+        f"            <li><a href=\"{chapter.replace('.', '_')}.html\">Chapter {chapter}</a></li>\n"
+        for chapter in chapters
+    )
 
     index_content += f"""
         </ul>
         <footer>
-            Generated on {datetime.now().strftime("%Y-%m-%d at %H:%M:%S")} from the PostgreSQL database
+            Generated on {timestamp} from the PostgreSQL database
         </footer>
     </div>
 </body>
@@ -66,16 +66,30 @@ def create_predictor_maps(mythic_predictors, skeptic_predictors):
     
     return mythic_color_map, skeptic_color_map, mythic_class_map, skeptic_class_map
 
-def highlight_passage(passage, predictor_map, color_map, class_map, is_mythic_page=True):
+def compile_predictor_patterns(predictor_map):
+    """Return (predictor, whole-word regex) pairs, longest predictor first.
+
+    Build this once per page type and pass it to highlight_passage, rather
+    than re-sorting and re-compiling the predictors for every passage.
+    """
+    # Longest first to avoid partial matches
+    predictors = sorted(predictor_map.keys(), key=len, reverse=True)
+    return [
+        (predictor, re.compile(r'\b' + re.escape(predictor) + r'\b'))
+        for predictor in predictors
+    ]
+
+def highlight_passage(passage, predictor_map, color_map, class_map, is_mythic_page=True,
+                      patterns=None):
     """Highlight words in the passage based on their predictive power."""
     # Escape HTML characters
     highlighted_passage = html.escape(passage)
     
-    # Sort predictors by length (longest first) to avoid partial matches
-    predictors = sorted(predictor_map.keys(), key=len, reverse=True)
+    if patterns is None:
+        patterns = compile_predictor_patterns(predictor_map)
     
     # Replace each predictor with a colored version
-    for predictor in predictors:
+    for predictor, pattern in patterns:
         if predictor in passage:
             color = color_map.get(predictor, 'black')
             css_class = class_map.get(predictor, '')
@@ -89,11 +103,8 @@ def highlight_passage(passage, predictor_map, color_map, class_map, is_mythic_pa
                 if css_class == 'non-skeptical':
                     style_class = ' non-skeptical'
             
-            # Create a regex pattern that matches the whole word/phrase
-            pattern = r'\b' + re.escape(predictor) + r'\b'
-            
             # Highlight the word/phrase
             replacement = f'<span style="color: {color};" class="{css_class}{style_class}">{predictor}</span>'
-            highlighted_passage = re.sub(pattern, replacement, highlighted_passage)
+            highlighted_passage = pattern.sub(replacement, highlighted_passage)
     
     return highlighted_passage
\ No newline at end of file
@@ -53,6 +53,8 @@ from .data import (
     get_section_people_analysis,
     calculate_translation_mythic_coefficient_relationship,
     add_phrase_translations,
+    split_predictors,
+    split_passages_by_chapter,
 )
 from .structure import create_website_structure
 from .highlighting import create_predictor_maps
@@ -135,17 +137,17 @@ def main():
     args = parse_arguments()
 
     # Connect to the database
-    conn = connect(args.database_url)
+    conn = connect(args.database_url, read_heavy=True)
 
     # Initialize OpenAI client if translation is requested
     client = None
     if args.translate_phrases:
         sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         from phrase_translator import load_openai_api_key, create_phrase_translations_table
-        from openai import OpenAI
+        from pausanias_openai import create_openai_client
 
         api_key = load_openai_api_key(args.openai_api_key_file)
-        client = OpenAI(api_key=api_key)
+        client = create_openai_client(api_key)
         create_phrase_translations_table(conn)
         print("LLM translation enabled for missing phrase translations")
 
@@ -155,7 +157,6 @@ def main():
         mythic_predictors = get_mythicness_predictors(conn)
         skeptic_predictors = get_skepticism_predictors(conn)
         proper_nouns_dict = get_proper_nouns_by_passage(conn)
-        sentences_df = get_all_sentences(conn)
         greta_sentences_df = get_greta_sentence_annotations(conn)
         classifier_comparison = get_classifier_comparison(conn)
         sentence_review_sample_df = get_sentence_review_sample(conn)
@@ -326,10 +327,12 @@ def main():
             output_dir,
             args.title,
         )
-        generate_mythic_page(passages_df, mythic_color_map, mythic_class_map, proper_nouns_dict, output_dir, args.title)
-        generate_skepticism_page(passages_df, skeptic_color_map, skeptic_class_map, proper_nouns_dict, output_dir, args.title)
+        # Both chapter-page sets share one chapter split of the passages
+        chapter_passages = split_passages_by_chapter(passages_df)
+        generate_mythic_page(chapter_passages, mythic_color_map, mythic_class_map, proper_nouns_dict, output_dir, args.title)
+        generate_skepticism_page(chapter_passages, skeptic_color_map, skeptic_class_map, proper_nouns_dict, output_dir, args.title)
         generate_mythic_words_page(
-            mythic_predictors,
+            *split_predictors(mythic_predictors, "is_mythic"),
             output_dir,
             args.title,
             passage_mythic_metrics,
@@ -337,16 +340,18 @@ def main():
             simplified_metrics=simplified_mythic_metrics,
         )
         generate_skeptic_words_page(
-            skeptic_predictors,
+            *split_predictors(skeptic_predictors, "is_skeptical"),
             output_dir,
             args.title,
             passage_skeptic_metrics,
             simplified_predictors=simplified_skeptic_predictors,
             simplified_metrics=simplified_skeptic_metrics,
         )
-        generate_sentences_page(sentences_df, output_dir, args.title)
+        # Only this page needs the full sentence table, so load it here and
+        # let it go straight after rather than holding it for the whole build
+        generate_sentences_page(get_all_sentences(conn), output_dir, args.title)
         generate_sentence_mythic_words_page(
-            sentence_mythic_predictors,
+            *split_predictors(sentence_mythic_predictors, "is_mythic"),
             output_dir,
             args.title,
             sentence_mythic_metrics,
@@ -354,7 +359,7 @@ def main():
             simplified_metrics=sentence_simplified_mythic_metrics,
         )
         generate_sentence_skeptic_words_page(
-            sentence_skeptic_predictors,
+            *split_predictors(sentence_skeptic_predictors, "is_skeptical"),
             output_dir,
             args.title,
             sentence_skeptic_metrics,